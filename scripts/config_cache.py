@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""YAML config loading with a JSON sidecar cache, shared by the skill scripts."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def _json_round_trips(obj) -> bool:
+    """True when every mapping key, at any depth, is a string, so JSON hands back the same dict."""
+    if isinstance(obj, dict):
+        return all(isinstance(k, str) and _json_round_trips(v) for k, v in obj.items())
+    if isinstance(obj, list):
+        return all(_json_round_trips(v) for v in obj)
+    return True
+
+
+def _write_sidecar(sidecar: Path, cfg: dict) -> None:
+    tmp_name = None
+    try:
+        with tempfile.NamedTemporaryFile("w", dir=sidecar.parent, suffix=".tmp", delete=False) as tmp:
+            tmp_name = tmp.name
+            json.dump(cfg, tmp)
+        os.replace(tmp_name, sidecar)
+    except (OSError, TypeError, ValueError):
+        if tmp_name:
+            Path(tmp_name).unlink(missing_ok=True)
+
+
+def load_yaml_cached(path: Path) -> dict:
+    """Parse a YAML config, preferring its JSON sidecar (<name>.json) when not older than the YAML.
+
+    Configs with non-string keys get no sidecar (JSON would turn {1: ...} into {"1": ...}),
+    so they are parsed from YAML every time.
+    """
+    try:
+        src_mtime = path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    sidecar = path.with_name(path.name + ".json")
+    try:
+        if sidecar.stat().st_mtime_ns >= src_mtime:
+            cfg = json.loads(sidecar.read_bytes())
+            return cfg if isinstance(cfg, dict) else {}
+    except (OSError, ValueError):
+        pass
+
+    import yaml
+
+    # libyaml's C loader when PyYAML was built with it.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path) as f:
+        cfg = yaml.load(f, Loader=loader) or {}
+    if not isinstance(cfg, dict):
+        return {}
+    if _json_round_trips(cfg):
+        _write_sidecar(sidecar, cfg)
+    return cfg
@@ -14,14 +14,27 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import importlib.util
 import json
+import os
 import subprocess
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timezone
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
+from types import ModuleType
 from typing import Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 BRIEFINGS_DIR = REPO_ROOT / "workspace" / "briefings"
 ALERTS_DIR = REPO_ROOT / "workspace" / "alerts"
@@ -34,9 +47,35 @@ PORTFOLIO_DRAWDOWN = REPO_ROOT / "skills" / "risk-calculator" / "scripts" / "por
 EXPOSURE_SUMMARY = REPO_ROOT / "skills" / "risk-calculator" / "scripts" / "exposure_summary.py"
 GET_PHASES = REPO_ROOT / "skills" / "phase-analyzer" / "scripts" / "get_phases.py"
 GET_NEWS = REPO_ROOT / "skills" / "market-news" / "scripts" / "get_news.py"
+# Command-line forms, converted once.
+GET_POSITIONS_S = str(GET_POSITIONS)
+CHECK_STOPS_S = str(CHECK_STOPS)
+PORTFOLIO_DRAWDOWN_S = str(PORTFOLIO_DRAWDOWN)
+EXPOSURE_SUMMARY_S = str(EXPOSURE_SUMMARY)
+GET_PHASES_S = str(GET_PHASES)
+GET_NEWS_S = str(GET_NEWS)
+
+_SCRIPT_LOAD_LOCK = threading.Lock()
+
+
+def _loads(data: str | bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0, default=str)
+    return json.dumps(obj, indent=2 if indent else None, default=str).encode("utf-8")
 
 
 def as_decimal(value: Any, default: str = "0") -> Decimal:
+    # JSON numbers skip the generic str() path; repr keeps floats' shortest decimal form.
+    # bool is an int subclass but was never a valid amount, so it falls through.
+    value_type = type(value)
+    if value_type is float:
+        return Decimal(repr(value))
+    if value_type is int:
+        return Decimal(value)
     try:
         return Decimal(str(value))
     except Exception:
@@ -47,41 +86,54 @@ def q2(value: Any) -> Decimal:
     return as_decimal(value).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
 
+def to_cents(value: Any) -> int:
+    # Half-up on the decimal form like q2; round(float * 100) is half-even on binary floats.
+    try:
+        return int(q2(value).scaleb(2))
+    except (ArithmeticError, ValueError):
+        return 0
+
+
 def fmt_currency(value: Any) -> str:
-    quantized = q2(value)
-    sign = "-" if quantized < 0 else ""
-    abs_value = abs(quantized)
-    return f"{sign}${abs_value:,.2f}"
+    # Display only: no arithmetic follows, so integer cents are enough.
+    cents = to_cents(value)
+    sign = "-" if cents < 0 else ""
+    dollars, cents = divmod(abs(cents), 100)
+    return f"{sign}${dollars:,}.{cents:02d}"
 
 
 def fmt_pct(value: Any) -> str:
-    quantized = q2(value)
-    sign = "+" if quantized > 0 else ""
-    return f"{sign}{quantized:.2f}%"
+    hundredths = to_cents(value)
+    # Like the Decimal format, a negative that rounds to zero prints as -0.00%.
+    negative = hundredths < 0 or (hundredths == 0 and as_decimal(value).is_signed())
+    sign = "+" if hundredths > 0 else "-" if negative else ""
+    whole, frac = divmod(abs(hundredths), 100)
+    return f"{sign}{whole}.{frac:02d}%"
 
 
 def run_json(cmd: list[str], timeout_s: int = 180) -> dict[str, Any]:
     try:
+        # Raw bytes: orjson parses them directly, so stdout is never decoded on success.
         proc = subprocess.run(
             cmd,
+            stdin=subprocess.DEVNULL,
             capture_output=True,
-            text=True,
             timeout=timeout_s,
             cwd=REPO_ROOT,
         )
     except Exception as exc:
         return {"error": str(exc), "_command": cmd}
 
-    stdout = (proc.stdout or "").strip()
-    stderr = (proc.stderr or "").strip()
+    stdout = (proc.stdout or b"").strip()
+    stderr = (proc.stderr or b"").decode("utf-8", errors="replace").strip()
 
     parsed: dict[str, Any]
     if stdout:
         try:
-            payload = json.loads(stdout)
+            payload = _loads(stdout)
             parsed = payload if isinstance(payload, dict) else {"result": payload}
-        except json.JSONDecodeError:
-            parsed = {"error": "Invalid JSON output", "rawStdout": stdout}
+        except ValueError:
+            parsed = {"error": "Invalid JSON output", "rawStdout": stdout.decode("utf-8", errors="replace")}
     else:
         parsed = {}
 
@@ -93,22 +145,75 @@ def run_json(cmd: list[str], timeout_s: int = 180) -> dict[str, Any]:
     return parsed
 
 
+def load_script(path: str) -> ModuleType:
+    """Import a skill script by file path, once per process, with its directory importable."""
+    name = "_riskos_" + Path(path).stem
+    with _SCRIPT_LOAD_LOCK:
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        script_dir = str(Path(path).parent)
+        if script_dir not in sys.path:
+            sys.path.insert(0, script_dir)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        return module
+
+
+def run_step(
+    script: str,
+    cli_args: list[str],
+    timeout_s: int,
+    isolate: bool = False,
+    **run_kwargs: Any,
+) -> dict[str, Any]:
+    """Run a skill script's run() in this interpreter, or as a subprocess when isolate is set."""
+    if isolate:
+        return run_json([sys.executable, script, *cli_args], timeout_s=timeout_s)
+    try:
+        payload = load_script(script).run(**run_kwargs)
+    except (Exception, SystemExit) as exc:
+        return {"error": f"{Path(script).name}: {exc!r}"}
+    return payload if isinstance(payload, dict) else {"result": payload}
+
+
+def sort_by_ticker(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Rows ordered by ticker. Skill scripts emit str tickers, so itemgetter is the fast path."""
+    try:
+        return sorted(rows, key=itemgetter("ticker"))
+    except (KeyError, TypeError):
+        return sorted(rows, key=lambda r: str(r.get("ticker", "")))
+
+
 def unique_lines(lines: list[str]) -> list[str]:
-    seen: set[str] = set()
-    out: list[str] = []
-    for line in lines:
-        if line in seen:
-            continue
-        seen.add(line)
-        out.append(line)
-    return out
+    # dict keys keep first-seen order.
+    return list(dict.fromkeys(lines))
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write via a temp file and rename, so readers never see a truncated file."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False) as tmp:
+        tmp.write(data)
+    try:
+        # NamedTemporaryFile creates 0600; keep the usual briefing file mode.
+        os.chmod(tmp.name, 0o644)
+        os.replace(tmp.name, path)
+    except OSError:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
 
 
 def load_state(path: Path) -> dict[str, Any]:
     if not path.exists():
         return {}
     try:
-        payload = json.loads(path.read_text())
+        payload = _loads(path.read_bytes())
         return payload if isinstance(payload, dict) else {}
     except Exception:
         return {}
@@ -116,7 +221,7 @@ def load_state(path: Path) -> dict[str, Any]:
 
 def save_state(path: Path, state: dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(state, indent=2))
+    _atomic_write_bytes(path, _dumps(state, indent=True))
 
 
 def phase_as_int(value: Any) -> int | None:
@@ -135,7 +240,8 @@ def headline_hash(item: dict[str, Any]) -> str:
             str(item.get("publishedAt", "")).strip(),
         ]
     )
-    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    # 64-bit dedup key; blake2b emits it directly instead of truncating sha256.
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
 
 
 def choose_actionable_thought(hard_alerts: list[str], phases: list[dict[str, Any]]) -> str | None:
@@ -154,15 +260,17 @@ def choose_actionable_thought(hard_alerts: list[str], phases: list[dict[str, Any
     return None
 
 
-def load_phase_transition_pairs() -> set[tuple[int, int]]:
-    default_pairs = {(3, 4), (4, 5)}
+@lru_cache(maxsize=1)
+def load_phase_transition_pairs() -> frozenset[tuple[int, int]]:
+    default_pairs = frozenset({(3, 4), (4, 5)})
     try:
         import yaml
 
         if not RISK_RULES_PATH.exists():
             return default_pairs
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(RISK_RULES_PATH) as f:
-            cfg = yaml.safe_load(f) or {}
+            cfg = yaml.load(f, Loader=loader) or {}
         hard_alerts = cfg.get("hard_alerts", {}) if isinstance(cfg, dict) else {}
         raw_pairs = hard_alerts.get("phase_transition_pairs", [])
         if not isinstance(raw_pairs, list):
@@ -175,7 +283,7 @@ def load_phase_transition_pairs() -> set[tuple[int, int]]:
                 out.add((int(item[0]), int(item[1])))
             except Exception:
                 continue
-        return out or default_pairs
+        return frozenset(out) or default_pairs
     except Exception:
         return default_pairs
 
@@ -204,6 +312,16 @@ def parse_args() -> argparse.Namespace:
         help="Directory for briefing outputs.",
     )
     parser.add_argument("--no-news-cache", action="store_true", help="Disable news cache for this run.")
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run each step in its own Python subprocess (enforces per-step timeouts).",
+    )
+    parser.add_argument(
+        "--include-inputs",
+        action="store_true",
+        help="Embed every step's raw output under \"inputs\" in the briefing JSON.",
+    )
     return parser.parse_args()
 
 
@@ -215,40 +333,53 @@ def main() -> int:
     state_loaded = bool(previous_state)
     hard_phase_transition_pairs = load_phase_transition_pairs()
 
-    py = sys.executable
+    isolate = args.isolate
 
-    positions_data = run_json([py, str(GET_POSITIONS)], timeout_s=120)
+    positions_data = run_step(GET_POSITIONS_S, [], 120, isolate)
     positions = positions_data.get("positions", []) if isinstance(positions_data.get("positions"), list) else []
     summary = positions_data.get("summary", {}) if isinstance(positions_data.get("summary"), dict) else {}
     tickers = sorted({str(p.get("ticker", "")).upper() for p in positions if p.get("ticker")})
 
-    stops_data = run_json([py, str(CHECK_STOPS)], timeout_s=90)
-    drawdown_data = run_json([py, str(PORTFOLIO_DRAWDOWN)], timeout_s=90)
-    exposure_data = run_json([py, str(EXPOSURE_SUMMARY)], timeout_s=90)
-
-    phases_data: dict[str, Any]
-    if tickers:
-        phases_data = run_json([py, str(GET_PHASES), *tickers], timeout_s=240)
-    else:
-        phases_data = {"phases": [], "status": "No tickers"}
+    # The remaining checks only read positions.json / tickers, so run them side by side.
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        stops_future = pool.submit(run_step, CHECK_STOPS_S, [], 90, isolate)
+        drawdown_future = pool.submit(run_step, PORTFOLIO_DRAWDOWN_S, [], 90, isolate)
+        exposure_future = pool.submit(run_step, EXPOSURE_SUMMARY_S, [], 90, isolate)
+        phases_future = news_future = None
+        if tickers:
+            phases_future = pool.submit(run_step, GET_PHASES_S, tickers, 240, isolate, tickers=tickers)
+            news_args = [*tickers, "--since", args.since]
+            if args.no_news_cache:
+                news_args.append("--no-cache")
+            news_future = pool.submit(
+                run_step,
+                GET_NEWS_S,
+                news_args,
+                180,
+                isolate,
+                tickers=tickers,
+                since=args.since,
+                no_cache=args.no_news_cache,
+            )
+
+        stops_data = stops_future.result()
+        drawdown_data = drawdown_future.result()
+        exposure_data = exposure_future.result()
+        phases_data: dict[str, Any] = (
+            phases_future.result() if phases_future else {"phases": [], "status": "No tickers"}
+        )
+        news_data: dict[str, Any] = (
+            news_future.result() if news_future else {"headlines": [], "alerts": [], "status": "No tickers"}
+        )
     phases = phases_data.get("phases", []) if isinstance(phases_data.get("phases"), list) else []
 
-    news_data: dict[str, Any]
-    if tickers:
-        news_cmd = [py, str(GET_NEWS), *tickers, "--since", args.since]
-        if args.no_news_cache:
-            news_cmd.append("--no-cache")
-        news_data = run_json(news_cmd, timeout_s=180)
-    else:
-        news_data = {"headlines": [], "alerts": [], "status": "No tickers"}
-
     hard_alerts: list[str] = []
     daily_pnl_pct = drawdown_data.get("dailyPnlPct", summary.get("dailyPnlPct", 0))
     if drawdown_data.get("alert"):
         hard_alerts.append(f"Portfolio daily move is {fmt_pct(daily_pnl_pct)} (hard-alert threshold breached).")
 
     stop_alerts = stops_data.get("alerts", []) if isinstance(stops_data.get("alerts"), list) else []
-    for alert in sorted(stop_alerts, key=lambda a: str(a.get("ticker", ""))):
+    for alert in sort_by_ticker(stop_alerts):
         hard_alerts.append(
             f"{alert.get('ticker', '?')} stop {alert.get('status', 'alert')}: "
             f"price {fmt_currency(alert.get('currentPrice', 0))}, "
@@ -259,7 +390,6 @@ def main() -> int:
     news_alerts = news_data.get("alerts", []) if isinstance(news_data.get("alerts"), list) else []
     for alert in sorted(str(x) for x in news_alerts):
         hard_alerts.append(f"News alert: {alert}")
-    hard_alerts = unique_lines(hard_alerts)
 
     watch_flags: list[str] = []
     phase_transitions: list[str] = []
@@ -267,7 +397,7 @@ def main() -> int:
     if not isinstance(previous_phase_map, dict):
         previous_phase_map = {}
     phase_rows = [p for p in phases if isinstance(p, dict) and not p.get("error")]
-    for row in sorted(phase_rows, key=lambda p: str(p.get("ticker", ""))):
+    for row in sort_by_ticker(phase_rows):
         ticker = row.get("ticker", "?")
         phase = phase_as_int(row.get("phase"))
         previous_phase = phase_as_int(previous_phase_map.get(str(ticker)))
@@ -292,7 +422,7 @@ def main() -> int:
             watch_flags.append(f"{ticker} shows bearish HMA cross behavior.")
 
     exposure_flags = exposure_data.get("reEvalFlags", []) if isinstance(exposure_data.get("reEvalFlags"), list) else []
-    for flag in sorted(exposure_flags, key=lambda f: str(f.get("ticker", ""))):
+    for flag in sort_by_ticker(exposure_flags):
         watch_flags.append(
             f"{flag.get('ticker', '?')} concentration at {fmt_pct(flag.get('weightPct', 0))} "
             f"({flag.get('reason', 'review')})."
@@ -304,15 +434,12 @@ def main() -> int:
     previous_news_hashes = previous_state.get("newsHashes", [])
     if not isinstance(previous_news_hashes, list):
         previous_news_hashes = []
-    previous_news_hash_set = {str(h) for h in previous_news_hashes}
+    # The state file only ever holds hex strings; anything else cannot match a digest.
+    previous_news_hash_set = frozenset(h for h in previous_news_hashes if isinstance(h, str))
 
-    new_headlines: list[dict[str, Any]] = []
-    all_headline_hashes: list[str] = []
-    for item in headlines:
-        digest = headline_hash(item)
-        all_headline_hashes.append(digest)
-        if digest not in previous_news_hash_set:
-            new_headlines.append(item)
+    all_headline_hashes = [headline_hash(item) for item in headlines]
+    new_hashes = set(all_headline_hashes) - previous_news_hash_set
+    new_headlines = [item for item, digest in zip(headlines, all_headline_hashes) if digest in new_hashes]
 
     # Show only newly seen items after first run; first run includes all available.
     external_events = build_external_events(new_headlines if state_loaded else headlines)
@@ -355,15 +482,17 @@ def main() -> int:
             "phaseTransitions": phase_transitions,
             "newHeadlinesCount": len(new_headlines),
         },
-        "inputs": {
+    }
+    # Raw step outputs dominate the file size; only embed them on request.
+    if args.include_inputs:
+        briefing_json["inputs"] = {
             "positions": positions_data,
             "stops": stops_data,
             "drawdown": drawdown_data,
             "exposure": exposure_data,
             "phases": phases_data,
             "news": news_data,
-        },
-    }
+        }
 
     md_lines = [
         f"# Morning Briefing - {args.date}",
@@ -406,8 +535,8 @@ def main() -> int:
 
     json_path = output_dir / f"{args.date}.json"
     md_path = output_dir / f"{args.date}.md"
-    json_path.write_text(json.dumps(briefing_json, indent=2))
-    md_path.write_text("\n".join(md_lines))
+    _atomic_write_bytes(json_path, _dumps(briefing_json, indent=True))
+    _atomic_write_bytes(md_path, "\n".join(md_lines).encode("utf-8"))
 
     latest_phase_map: dict[str, int] = {}
     for row in phase_rows:
@@ -424,7 +553,7 @@ def main() -> int:
     save_state(STATE_PATH, next_state)
 
     print(
-        json.dumps(
+        _dumps(
             {
                 "status": "ok",
                 "asOfDate": args.date,
@@ -437,7 +566,7 @@ def main() -> int:
                 "newHeadlines": len(new_headlines),
                 "stateFile": str(STATE_PATH),
             }
-        )
+        ).decode()
     )
     return 0
 
@@ -18,14 +18,45 @@ import argparse
 import hashlib
 import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlsplit
 from urllib.request import Request, urlopen
 
-CACHE_DIR = Path("workspace/news")
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+CACHE_DIR = REPO_ROOT / "workspace" / "news"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# Cap on concurrent provider requests per run.
+MAX_FETCH_WORKERS = 8
+USER_AGENT = "risk-os-agent/1.0"
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps_bytes(obj) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
+
+
+def _dumps(obj) -> str:
+    return _dumps_bytes(obj).decode()
+
 
 ADVERSARIAL_KEYWORDS = (
     "short report",
@@ -86,21 +117,59 @@ def parse_since_window(since: str) -> datetime:
     return datetime.now(timezone.utc) - delta
 
 
+def _keyword_pattern(keywords: tuple[str, ...]) -> re.Pattern[str]:
+    # Plain substring alternation: same matches as `word in text`, one scan per category.
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+ADVERSARIAL_RE = _keyword_pattern(ADVERSARIAL_KEYWORDS)
+MAJOR_RE = _keyword_pattern(MAJOR_KEYWORDS)
+MACRO_RE = _keyword_pattern(MACRO_KEYWORDS)
+
+
+# Wire headlines repeat verbatim across tickers; lru_cache is thread-safe for the fetch pool.
+@lru_cache(maxsize=8192)
 def classify_text(text: str) -> str:
     lowered = text.lower()
-    if any(word in lowered for word in ADVERSARIAL_KEYWORDS):
+    if ADVERSARIAL_RE.search(lowered):
         return "adversarial"
-    if any(word in lowered for word in MAJOR_KEYWORDS):
+    if MAJOR_RE.search(lowered):
         return "major"
-    if any(word in lowered for word in MACRO_KEYWORDS):
+    if MACRO_RE.search(lowered):
         return "macro"
     return "relevant"
 
 
+def _make_session():
+    # One pooled keep-alive session for the whole fetch fan-out; plain GETs are thread-safe.
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=MAX_FETCH_WORKERS))
+    return session
+
+
+_SESSION = _make_session() if requests is not None else None
+
+
+def _without_query(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
 def fetch_json(url: str, timeout_s: int = 12) -> dict | list:
-    req = Request(url, headers={"User-Agent": "risk-os-agent/1.0"})
+    if _SESSION is not None:
+        # requests puts the full URL, API key included, into its error text; report
+        # only the status (as urllib did) or the error type and the query-less URL.
+        try:
+            resp = _SESSION.get(url, timeout=timeout_s)
+        except requests.RequestException as exc:
+            raise RuntimeError(f"{type(exc).__name__} for {_without_query(url)}") from None
+        if not resp.ok:
+            raise RuntimeError(f"HTTP Error {resp.status_code}: {resp.reason}")
+        return _loads(resp.content)
+    req = Request(url, headers={"User-Agent": USER_AGENT})
     with urlopen(req, timeout=timeout_s) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+        return _loads(resp.read())
 
 
 def fetch_newsapi(ticker: str, api_key: str, since_dt: datetime) -> list[dict]:
@@ -202,13 +271,15 @@ def cache_path(source: str, ticker: str, since: str) -> Path:
 
 
 def load_cache(path: Path, ttl_minutes: int) -> list[dict] | None:
-    if not path.exists():
+    # One stat both checks existence and yields the mtime.
+    try:
+        st = path.stat()
+    except OSError:
         return None
-    age = datetime.now(timezone.utc) - datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
-    if age > timedelta(minutes=ttl_minutes):
+    if time.time_ns() - st.st_mtime_ns > ttl_minutes * 60_000_000_000:
         return None
     try:
-        data = json.loads(path.read_text())
+        data = _loads(path.read_bytes())
         return data.get("headlines", []) if isinstance(data, dict) else None
     except Exception:
         return None
@@ -219,31 +290,25 @@ def write_cache(path: Path, headlines: list[dict]) -> None:
         "savedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         "headlines": headlines,
     }
-    path.write_text(json.dumps(payload))
-
+    path.write_bytes(_dumps_bytes(payload))
 
-def main() -> None:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("tickers", nargs="+")
-    parser.add_argument("--since", default="24h")
-    parser.add_argument("--no-cache", action="store_true")
-    args = parser.parse_args()
 
-    tickers = [t.upper().strip() for t in args.tickers if t.strip()]
-    since_dt = parse_since_window(args.since)
+def run(tickers: list[str], since: str = "24h", no_cache: bool = False) -> dict:
+    """Scored headlines and alerts for tickers. Errors are returned in the payload."""
+    tickers = [t.upper().strip() for t in tickers if t.strip()]
+    since_dt = parse_since_window(since)
 
     api_key = os.environ.get("NEWS_API_KEY") or os.environ.get("NEWS_API_KEY_ALT")
     source = os.environ.get("NEWS_API_SOURCE", "newsapi").lower()
     ttl_minutes = int(os.environ.get("NEWS_CACHE_TTL_MIN", "15"))
 
     if not api_key:
-        print(json.dumps({
+        return {
             "headlines": [],
             "alerts": [],
             "error": "NEWS_API_KEY not set. Configure a provider key and retry.",
             "status": "No provider configured",
-        }))
-        return
+        }
 
     provider_map: dict[str, Callable[[str, str, datetime], list[dict]]] = {
         "newsapi": fetch_newsapi,
@@ -253,33 +318,48 @@ def main() -> None:
     provider = provider_map.get(source)
     if provider is None:
         supported = ", ".join(sorted(provider_map.keys()))
-        print(json.dumps({
+        return {
             "headlines": [],
             "alerts": [],
             "error": f"Unsupported NEWS_API_SOURCE='{source}'. Supported: {supported}",
-        }))
-        return
+        }
 
-    headlines: list[dict] = []
-    errors: list[str] = []
+    # Cache reads stay serial; only cache-miss HTTP calls fan out.
+    by_ticker: dict[str, list[dict]] = {}
+    errors_by_ticker: dict[str, str] = {}
+    misses: list[str] = []
     cache_hits = 0
 
     for ticker in tickers:
-        cpath = cache_path(source, ticker, args.since)
-        if not args.no_cache:
-            cached = load_cache(cpath, ttl_minutes=ttl_minutes)
+        if not no_cache:
+            cached = load_cache(cache_path(source, ticker, since), ttl_minutes=ttl_minutes)
             if cached is not None:
-                headlines.extend(cached)
+                by_ticker[ticker] = cached
                 cache_hits += 1
                 continue
-
-        try:
-            fetched = provider(ticker, api_key, since_dt)
-            headlines.extend(fetched)
-            if not args.no_cache:
-                write_cache(cpath, fetched)
-        except Exception as exc:
-            errors.append(f"{ticker}: {exc}")
+        misses.append(ticker)
+
+    if misses:
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(misses))) as pool:
+            futures = {pool.submit(provider, ticker, api_key, since_dt): ticker for ticker in misses}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    fetched = future.result()
+                except Exception as exc:
+                    errors_by_ticker[ticker] = f"{ticker}: {exc}"
+                    continue
+                by_ticker[ticker] = fetched
+                if not no_cache:
+                    write_cache(cache_path(source, ticker, since), fetched)
+
+    # Reassemble in ticker order so output and dedup winners do not depend on timing.
+    headlines: list[dict] = []
+    errors: list[str] = []
+    for ticker in tickers:
+        headlines.extend(by_ticker.get(ticker, ()))
+        if ticker in errors_by_ticker:
+            errors.append(errors_by_ticker[ticker])
 
     headlines = deduplicate(headlines)
 
@@ -293,17 +373,26 @@ def main() -> None:
         "headlines": headlines,
         "alerts": alerts,
         "source": source,
-        "since": args.since,
+        "since": since,
         "cache": {
-            "enabled": not args.no_cache,
+            "enabled": not no_cache,
             "ttlMinutes": ttl_minutes,
             "hits": cache_hits,
         },
     }
     if errors:
         out["errors"] = errors
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--since", default="24h")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
 
-    print(json.dumps(out))
+    print(_dumps(run(args.tickers, since=args.since, no_cache=args.no_cache)))
 
 
 if __name__ == "__main__":
@@ -8,48 +8,44 @@ Requires: pip install yfinance pyyaml
 import json
 import sys
 
-from phase_core import analyze_closes, dump_error_and_exit
+import numpy as np
 
+from phase_core import analyze_closes, dump_error_and_exit, load_cached_closes, save_cached_closes
 
-def main():
-    if len(sys.argv) < 2:
-        dump_error_and_exit("Usage: get_phase.py TICKER")
 
-    ticker = sys.argv[1].upper()
+def compute_phase(ticker: str) -> dict:
+    """Phase payload for one ticker. Errors are returned in the payload, not raised."""
+    ticker = ticker.upper()
 
-    try:
-        import yfinance as yf
-    except ImportError:
-        dump_error_and_exit("yfinance required: pip install yfinance", ticker=ticker)
+    closes = load_cached_closes(ticker)
+    if closes is None:
+        try:
+            import yfinance as yf
+        except ImportError:
+            return {"error": "yfinance required: pip install yfinance", "ticker": ticker}
 
-    hist = yf.download(ticker, period="3mo", interval="1d", progress=False, auto_adjust=True)
-    if hist.empty or "Close" not in hist:
-        dump_error_and_exit("Insufficient data", ticker=ticker)
+        hist = yf.download(ticker, period="3mo", interval="1d", progress=False, auto_adjust=True, actions=False)
+        if hist.empty or "Close" not in hist:
+            return {"error": "Insufficient data", "ticker": ticker}
 
-    closes = hist["Close"].dropna().tolist()
-    out = analyze_closes(ticker=ticker, closes=closes)
+        close = hist["Close"]
+        # Newer yfinance keys single-ticker frames by (field, ticker) too.
+        if close.ndim > 1:
+            close = close.iloc[:, 0]
+        closes = close.dropna().to_numpy(dtype=np.float64)
+        save_cached_closes(ticker, closes)
 
-    prev_price = closes[-2] if len(closes) > 1 else price
+    return analyze_closes(ticker=ticker, closes=closes)
 
-    # HMA cross: detect price crossing through HMA using prior close vs prior HMA.
-    if prev_price >= hma_prev and price < hma_val:
-        hma_cross = "bearish"
-    elif prev_price <= hma_prev and price > hma_val:
-        hma_cross = "bullish"
-    else:
-        hma_cross = "neutral"
 
-    if hma_val < hma_prev:
-        hma_trend = "falling"
-    elif hma_val > hma_prev:
-        hma_trend = "rising"
-    else:
-        hma_trend = "flat"
-    if "error" in out:
-        print(json.dumps(out))
-        sys.exit(1)
+def main():
+    if len(sys.argv) < 2:
+        dump_error_and_exit("Usage: get_phase.py TICKER")
 
+    out = compute_phase(sys.argv[1])
     print(json.dumps(out))
+    if "error" in out:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -8,67 +8,105 @@ from __future__ import annotations
 
 import json
 import sys
+from typing import TYPE_CHECKING
 
-import pandas as pd
+import numpy as np
 
-from phase_core import analyze_closes, dump_error_and_exit, load_config
+from phase_core import (
+    analyze_closes,
+    dump_error_and_exit,
+    load_cached_closes,
+    load_config,
+    save_cached_closes,
+)
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def _extract_closes(hist: pd.DataFrame, ticker: str) -> list[float]:
+
+def _extract_closes(hist: pd.DataFrame, tickers: list[str]) -> dict[str, np.ndarray]:
+    """Close series per ticker, pulled out of the batched frame in one pass."""
+    empty = np.empty(0, dtype=np.float64)
     if hist.empty:
-        return []
+        return {ticker: empty for ticker in tickers}
+
+    # Only reached after a download, when yfinance has already loaded pandas.
+    import pandas as pd
 
-    # Batched call with group_by='ticker' returns MultiIndex columns.
+    # Batched call with group_by='ticker' returns (ticker, field) MultiIndex columns.
     if isinstance(hist.columns, pd.MultiIndex):
-        if ticker in hist.columns.get_level_values(0):
-            series = hist[ticker]["Close"]
-            return series.dropna().tolist()
-        return []
+        if "Close" not in hist.columns.get_level_values(1):
+            return {ticker: empty for ticker in tickers}
+        unique = list(dict.fromkeys(tickers))
+        matrix = hist.xs("Close", axis=1, level=1).reindex(columns=unique).to_numpy(dtype=np.float64)
+        columns = {ticker: matrix[:, i] for i, ticker in enumerate(unique)}
+        return {ticker: columns[ticker][~np.isnan(columns[ticker])] for ticker in tickers}
 
     # Single-ticker shape fallback.
     if "Close" in hist:
-        return hist["Close"].dropna().tolist()
+        closes = hist["Close"].dropna().to_numpy(dtype=np.float64)
+        return {ticker: closes for ticker in tickers}
 
-    return []
+    return {ticker: empty for ticker in tickers}
 
 
-def main():
-    if len(sys.argv) < 2:
-        dump_error_and_exit("Usage: get_phases.py TICKER1 TICKER2 ...")
+def run(tickers: list[str]) -> dict:
+    """Phase payload for tickers; "error" is set when prices could not be downloaded."""
+    tickers = [t.upper() for t in tickers]
 
-    tickers = [t.upper() for t in sys.argv[1:]]
-
-    try:
-        import yfinance as yf
-    except ImportError:
-        print(
-            json.dumps(
-                {
-                    "phases": [
-                        {"ticker": ticker, "error": "yfinance required: pip install yfinance"}
-                        for ticker in tickers
-                    ]
-                }
+    closes_by_ticker = {}
+    missing = []
+    for ticker in tickers:
+        cached = load_cached_closes(ticker)
+        if cached is None:
+            missing.append(ticker)
+        else:
+            closes_by_ticker[ticker] = cached
+
+    download_error = None
+    if missing:
+        try:
+            import yfinance as yf
+        except ImportError:
+            download_error = "yfinance required: pip install yfinance"
+        else:
+            # yfinance fans the batch out per ticker; cap the pool to stay under Yahoo throttling.
+            hist = yf.download(
+                missing,
+                period="3mo",
+                interval="1d",
+                group_by="ticker",
+                progress=False,
+                auto_adjust=True,
+                actions=False,
+                threads=min(8, len(missing)),
             )
-        )
-        sys.exit(1)
-
-    hist = yf.download(
-        tickers,
-        period="3mo",
-        interval="1d",
-        group_by="ticker",
-        progress=False,
-        auto_adjust=True,
-    )
+            for ticker, closes in _extract_closes(hist, missing).items():
+                save_cached_closes(ticker, closes)
+                closes_by_ticker[ticker] = closes
 
     cfg = load_config()
     results = []
     for ticker in tickers:
-        closes = _extract_closes(hist, ticker)
-        results.append(analyze_closes(ticker=ticker, closes=closes, cfg=cfg))
+        if ticker not in closes_by_ticker:
+            results.append({"ticker": ticker, "error": download_error})
+            continue
+        results.append(analyze_closes(ticker=ticker, closes=closes_by_ticker[ticker], cfg=cfg))
 
-    print(json.dumps({"phases": results}))
+    out = {"phases": results}
+    if download_error:
+        out["error"] = download_error
+    return out
+
+
+def main():
+    if len(sys.argv) < 2:
+        dump_error_and_exit("Usage: get_phases.py TICKER1 TICKER2 ...")
+
+    out = run(sys.argv[1:])
+    print(json.dumps(out))
+    if "error" in out:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -4,64 +4,155 @@
 from __future__ import annotations
 
 import json
+import math
+import os
+import re
 import sys
+import tempfile
+import time
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
 
-# Add repo root for config
-REPO_ROOT = Path(__file__).resolve().parents[3]
-sys.path.insert(0, str(REPO_ROOT))
-
-
-def load_config() -> dict:
-    import yaml
-
-    cfg_path = REPO_ROOT / "config" / "phase-config.yaml"
-    if cfg_path.exists():
-        with open(cfg_path) as f:
-            return yaml.safe_load(f) or {}
-    return {}
+import numpy as np
 
-
-def ema(prices: list[float], period: int) -> float:
+# Add repo scripts dir for the shared config loader
+REPO_ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from config_cache import load_yaml_cached  # noqa: E402
+
+PRICE_CACHE_DIR = REPO_ROOT / "workspace" / "cache" / "prices"
+DEFAULT_PRICE_CACHE_TTL_H = 1.0
+
+
+@lru_cache(maxsize=1)
+def load_config() -> Mapping:
+    """Phase config, parsed once per process. Read-only, since every caller shares it."""
+    return MappingProxyType(load_yaml_cached(REPO_ROOT / "config" / "phase-config.yaml"))
+
+
+def price_cache_ttl_hours() -> float:
+    """Price cache TTL in hours from PHASE_CACHE_TTL_H; 0 disables the cache."""
+    try:
+        return float(os.environ.get("PHASE_CACHE_TTL_H", DEFAULT_PRICE_CACHE_TTL_H))
+    except ValueError:
+        return DEFAULT_PRICE_CACHE_TTL_H
+
+
+def price_cache_path(ticker: str, day: date | None = None) -> Path:
+    day = day or date.today()
+    return PRICE_CACHE_DIR / f"{ticker}_{day.strftime('%Y%m%d')}.json"
+
+
+def load_cached_closes(ticker: str) -> list[float] | None:
+    """Closes cached today for ticker, or None when missing, stale, or disabled."""
+    ttl_h = price_cache_ttl_hours()
+    if ttl_h <= 0:
+        return None
+    path = price_cache_path(ticker)
+    try:
+        if time.time() - path.stat().st_mtime > ttl_h * 3600:
+            return None
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    closes = data.get("closes") if isinstance(data, dict) else None
+    return closes if isinstance(closes, list) and closes else None
+
+
+def save_cached_closes(ticker: str, closes) -> None:
+    """Atomically write today's closes for ticker and drop its older cache files."""
+    if price_cache_ttl_hours() <= 0 or not len(closes):
+        return
+    path = price_cache_path(ticker)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=path.parent, suffix=".tmp", delete=False) as tmp:
+            json.dump({"closes": np.asarray(closes, dtype=np.float64).tolist()}, tmp)
+        os.replace(tmp.name, path)
+        # Exact <TICKER>_<YYYYMMDD>.json names only: a prefix glob would let BRK delete BRK_B's cache.
+        own_file = re.compile(rf"{re.escape(ticker)}_\d{{8}}\.json")
+        for stale in path.parent.iterdir():
+            if stale != path and own_file.fullmatch(stale.name):
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def ema(prices: list[float] | np.ndarray, period: int) -> float:
     """Exponential moving average. Deterministic."""
-    if not prices or len(prices) < period:
-        return prices[-1] if prices else 0.0
+    arr = np.asarray(prices, dtype=np.float64)
+    if not arr.size or arr.size < period:
+        return float(arr[-1]) if arr.size else 0.0
     k = 2 / (period + 1)
-    ema_val = sum(prices[:period]) / period
-    for p in prices[period:]:
+    # fsum keeps the seed exact regardless of summation order.
+    ema_val = math.fsum(arr[:period].tolist()) / period
+    for p in arr[period:].tolist():
         ema_val = ((p - ema_val) * k) + ema_val
     return round(ema_val, 4)
 
 
-def sma(prices: list[float], period: int) -> float:
+def sma(prices: list[float] | np.ndarray, period: int) -> float:
     """Simple moving average. Deterministic."""
-    if not prices or len(prices) < period:
-        return prices[-1] if prices else 0.0
-    return round(sum(prices[-period:]) / period, 4)
+    arr = np.asarray(prices, dtype=np.float64)
+    if not arr.size or arr.size < period:
+        return float(arr[-1]) if arr.size else 0.0
+    return round(float(arr[-period:].mean()), 4)
+
+
+def _wma_series(prices: np.ndarray, period: int) -> np.ndarray:
+    """Rolling WMA for every full window, oldest first. Linear weights 1..period.
 
+    Vectorized across windows but summed oldest to newest within each, so every value
+    is bit-identical to sum(w * p) / sum(w) and 4 dp rounding ties break the same way.
+    """
+    n_windows = prices.size - period + 1
+    acc = np.zeros(n_windows, dtype=np.float64)
+    for j in range(period):
+        acc += (j + 1) * prices[j : j + n_windows]
+    return acc / (period * (period + 1) // 2)
 
-def wma(prices: list[float], period: int) -> float:
+
+def _round4(values: np.ndarray) -> np.ndarray:
+    # Python's round() is correctly rounded; np.round scales first and can break near-ties differently.
+    return np.array([round(v, 4) for v in values.tolist()], dtype=np.float64)
+
+
+def wma(prices: list[float] | np.ndarray, period: int) -> float:
     """Weighted moving average. Deterministic."""
-    if not prices or len(prices) < period:
-        return prices[-1] if prices else 0.0
-    window = prices[-period:]
-    weights = list(range(1, period + 1))
-    return round(sum(w * p for w, p in zip(weights, window)) / sum(weights), 4)
+    arr = np.asarray(prices, dtype=np.float64)
+    if not arr.size or arr.size < period:
+        return float(arr[-1]) if arr.size else 0.0
+    return round(float(_wma_series(arr[-period:], period)[-1]), 4)
 
 
-def hma(prices: list[float], period: int) -> float:
-    """Hull Moving Average. Deterministic. Uses WMA(2*WMA(n/2)-WMA(n), sqrt(n))."""
+def hma_series(prices: list[float] | np.ndarray, period: int) -> np.ndarray:
+    """Hull Moving Average series: WMA(2*WMA(n/2)-WMA(n), sqrt(n)) for every full window.
+
+    Empty when there are fewer than period + sqrt(period) prices.
+    """
     half = max(1, period // 2)
     sqrt_period = max(1, int(period**0.5))
-    if not prices or len(prices) < period + sqrt_period:
-        return round(prices[-1], 4) if prices else 0.0
-    raw_vals = []
-    for i in range(period - 1, len(prices)):
-        window = prices[: i + 1]
-        w1 = wma(window, half)
-        w2 = wma(window, period)
-        raw_vals.append((2 * w1) - w2)
-    return round(wma(raw_vals, sqrt_period), 4)
+    arr = np.asarray(prices, dtype=np.float64)
+    if arr.size < period + sqrt_period:
+        return np.empty(0, dtype=np.float64)
+    # Align the half-period WMA on the windows the full-period WMA covers. Each
+    # intermediate WMA is rounded to 4 dp, as a per-window wma() call returns it.
+    wma_half = _round4(_wma_series(arr, half)[period - half :])
+    wma_full = _round4(_wma_series(arr, period))
+    raw = (2 * wma_half) - wma_full
+    return _wma_series(raw, sqrt_period)
+
+
+def hma(prices: list[float] | np.ndarray, period: int) -> float:
+    """Hull Moving Average. Deterministic. Uses WMA(2*WMA(n/2)-WMA(n), sqrt(n))."""
+    series = hma_series(prices, period)
+    if not series.size:
+        return round(float(prices[-1]), 4) if len(prices) else 0.0
+    return round(float(series[-1]), 4)
 
 
 def get_phase(price: float, ema10: float, sma30: float, hma_val: float, hma_prev: float) -> int:
@@ -82,21 +173,29 @@ def get_phase(price: float, ema10: float, sma30: float, hma_val: float, hma_prev
     return 5
 
 
-def analyze_closes(ticker: str, closes: list[float], cfg: dict | None = None) -> dict:
+def analyze_closes(ticker: str, closes: list[float] | np.ndarray, cfg: Mapping | None = None) -> dict:
     """Build phase output payload from close prices for a ticker."""
     cfg = cfg or load_config()
     ema_p = cfg.get("ema_period", 10)
     sma_p = cfg.get("sma_period", 30)
     hma_p = cfg.get("hma_period") or max(ema_p, sma_p)
 
-    if not closes or len(closes) < sma_p:
+    closes = np.asarray(closes, dtype=np.float64)
+    if not closes.size or closes.size < sma_p:
         return {"error": "Insufficient data", "ticker": ticker}
 
-    price = closes[-1]
+    price = float(closes[-1])
     ema10_val = ema(closes, ema_p)
     sma30_val = sma(closes, sma_p)
-    hma_val = hma(closes, hma_p)
-    hma_prev = hma(closes[:-1], hma_p) if len(closes) > 1 else hma_val
+    # One Hull pass yields both the latest and prior values.
+    hma_vals = hma_series(closes, hma_p)
+    hma_val = round(float(hma_vals[-1]), 4) if hma_vals.size else round(price, 4)
+    # The series is empty or has at least two values. The prior bar needs its own
+    # period + sqrt(period) closes, so with only two values it falls back to the prior close.
+    if hma_vals.size >= 3:
+        hma_prev = round(float(hma_vals[-2]), 4)
+    else:
+        hma_prev = round(float(closes[-2]), 4) if len(closes) > 1 else hma_val
     phase = get_phase(price, ema10_val, sma30_val, hma_val, hma_prev)
 
     if price < hma_val and price > hma_prev:
@@ -6,12 +6,24 @@ Env: SCHWAB_API_KEY, SCHWAB_APP_SECRET; optional SCHWAB_CALLBACK_URL, SCHWAB_TOK
 """
 
 import json
+import math
 import os
 import sys
 from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 REPO_ROOT = Path(__file__).resolve().parents[3]
+# Add repo scripts dir for the shared config loader
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from config_cache import load_yaml_cached  # noqa: E402
+
 WORKSPACE = REPO_ROOT / "workspace" / "portfolio"
 WORKSPACE.mkdir(parents=True, exist_ok=True)
 
@@ -19,29 +31,35 @@ TOKEN_PATH = Path(os.environ.get("SCHWAB_TOKEN_PATH", str(WORKSPACE / "token.jso
 STOPS_PATH = WORKSPACE / "stops.json"
 OUTPUT_PATH = WORKSPACE / "positions.json"
 
-LONG_CLOSE_INSTRUCTIONS = {"SELL", "SELL_TO_CLOSE"}
-SHORT_CLOSE_INSTRUCTIONS = {"BUY", "BUY_TO_COVER", "BUY_TO_CLOSE"}
+LONG_CLOSE_INSTRUCTIONS = frozenset({"SELL", "SELL_TO_CLOSE"})
+SHORT_CLOSE_INSTRUCTIONS = frozenset({"BUY", "BUY_TO_COVER", "BUY_TO_CLOSE"})
+# Below this, per-position numpy setup costs more than the scalar loop saves.
+VECTORIZE_MIN_POSITIONS = 32
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 
+def _dumps_bytes(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str).encode("utf-8")
 
+
+@lru_cache(maxsize=1)
 def load_risk_rules() -> dict:
-    cfg_path = REPO_ROOT / "config" / "risk-rules.yaml"
+    """Risk rules, parsed once per process. Treat the result as read-only."""
     try:
-        import yaml
-
-        if cfg_path.exists():
-            with open(cfg_path) as f:
-                cfg = yaml.safe_load(f) or {}
-                return cfg if isinstance(cfg, dict) else {}
+        return load_yaml_cached(REPO_ROOT / "config" / "risk-rules.yaml")
     except Exception:
-        pass
-    return {}
+        return {}
 
 
 def load_stops():
     """Local stops from workspace/portfolio/stops.json (fallback)."""
     if STOPS_PATH.exists():
-        with open(STOPS_PATH) as f:
-            return json.load(f)
+        return _loads(STOPS_PATH.read_bytes())
     return {}
 
 
@@ -52,6 +70,13 @@ def to_decimal(value, default="0"):
         return Decimal(default)
 
 
+def to_number(value, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
 def to_float(value):
     try:
         return float(Decimal(str(value)))
@@ -73,7 +98,15 @@ def get_balance_amount(balance_obj: dict, field_names: list[str]) -> Decimal | N
     return None
 
 
+@lru_cache(maxsize=128)
+def _normalize_instruction_str(value: str) -> str:
+    return value.strip().upper()
+
+
 def normalize_instruction(value) -> str:
+    # Instructions come from a small fixed vocabulary; only strings are hashable-safe to memoize.
+    if isinstance(value, str):
+        return _normalize_instruction_str(value)
     return str(value or "").strip().upper()
 
 
@@ -93,7 +126,7 @@ def resolve_local_stop(stops: dict, symbol: str, direction: str):
 
 
 def fetch_protective_orders(client, account_hash) -> dict:
-    """Fetch active protective orders. Returns {symbol: [candidate,...]}."""
+    """Fetch active protective orders. Returns {(symbol, direction): [candidate,...]} in order-book order."""
     candidates = {}
     try:
         from schwab.client import Client
@@ -128,7 +161,7 @@ def fetch_protective_orders(client, account_hash) -> dict:
         )
         if resp.status_code != 200:
             return candidates
-        data = resp.json()
+        data = _loads(resp.content)
         orders = data if isinstance(data, list) else data.get("orders", data.get("order", []))
         if not isinstance(orders, list):
             orders = []
@@ -145,22 +178,25 @@ def fetch_protective_orders(client, account_hash) -> dict:
                 if not symbol:
                     continue
 
+                # Bucket once by the position side each order protects, so lookups are a dict hit.
                 if order_type in allowed_types and stop_price is not None:
-                    candidates.setdefault(symbol, []).append(
-                        {
-                            "kind": "stop",
-                            "price": stop_price,
-                            "instruction": instruction,
-                            "orderType": order_type,
-                        }
-                    )
+                    candidate = {
+                        "kind": "stop",
+                        "price": stop_price,
+                        "instruction": instruction,
+                        "orderType": order_type,
+                    }
+                    if not instruction or instruction in LONG_CLOSE_INSTRUCTIONS:
+                        candidates.setdefault((symbol, "long"), []).append(candidate)
+                    if not instruction or instruction in SHORT_CLOSE_INSTRUCTIONS:
+                        candidates.setdefault((symbol, "short"), []).append(candidate)
                 elif (
                     short_limit_as_stop
                     and order_type == "LIMIT"
                     and limit_price is not None
                     and instruction in SHORT_CLOSE_INSTRUCTIONS
                 ):
-                    candidates.setdefault(symbol, []).append(
+                    candidates.setdefault((symbol, "short"), []).append(
                         {
                             "kind": "limit",
                             "price": limit_price,
@@ -173,6 +209,105 @@ def fetch_protective_orders(client, account_hash) -> dict:
     return candidates
 
 
+def position_fields(pos: dict) -> tuple[str, str, float, float, float] | None:
+    """(symbol, direction, qty, avg_price, mkt_val) from a Schwab position, or None to skip it."""
+    inst = pos.get("instrument", {}) or pos.get("symbol", {})
+    if isinstance(inst, dict):
+        symbol = inst.get("symbol") or inst.get("ticker")
+    else:
+        symbol = str(inst)
+    if not symbol:
+        return None
+
+    long_qty = to_number(pos.get("longQuantity", 0) or pos.get("quantity", 0))
+    short_qty = to_number(pos.get("shortQuantity", 0))
+    if long_qty > 0:
+        direction = "long"
+        qty = long_qty
+    elif short_qty > 0:
+        direction = "short"
+        qty = short_qty
+    else:
+        return None
+
+    avg_price = to_number(pos.get("averagePrice", 0) or pos.get("costBasis", 0) or 0)
+    if direction == "short" and avg_price < 0:
+        avg_price = abs(avg_price)
+
+    mkt_val = pos.get("marketValue") or pos.get("currentMarketValue")
+    if isinstance(mkt_val, dict):
+        mkt_val = mkt_val.get("amount") or mkt_val.get("value")
+    mkt_val = to_number(mkt_val or 0)
+    if not (math.isfinite(qty) and math.isfinite(avg_price) and math.isfinite(mkt_val)):
+        return None
+    return symbol, direction, qty, avg_price, mkt_val
+
+
+_CENT = Decimal("0.01")
+
+
+def _near_half_cent(value: float) -> bool:
+    """True when value is within float error of a half cent, where round() and Decimal can disagree."""
+    cents = abs(value) * 100
+    return abs(cents - math.floor(cents) - 0.5) <= 1e-9 * max(1.0, cents)
+
+
+def exact_figures(direction: str, qty: float, avg_price: float, mkt_val: float) -> tuple[float, float, float, float]:
+    """(avgCost, currentPrice, pnl, pnlPct) with Decimal math, half-even to cents.
+
+    repr() gives back each input's decimal spelling, so this matches quantizing the raw values.
+    """
+    qty_d, avg_d, mkt_d = Decimal(repr(qty)), Decimal(repr(avg_price)), Decimal(repr(mkt_val))
+    if direction == "short":
+        current = (abs(mkt_d) / qty_d).quantize(_CENT)
+        pnl = ((avg_d - current) * qty_d).quantize(_CENT)
+    else:
+        current = (mkt_d / qty_d).quantize(_CENT)
+        pnl = ((current - avg_d) * qty_d).quantize(_CENT)
+    cost = (avg_d * qty_d).quantize(_CENT)
+    pnl_pct = (pnl / cost * 100).quantize(_CENT) if cost else Decimal("0")
+    return float(avg_d.quantize(_CENT)), float(current), float(pnl), float(pnl_pct)
+
+
+def position_figures(direction: str, qty: float, avg_price: float, mkt_val: float) -> tuple[float, float, float, float]:
+    """(avgCost, currentPrice, pnl, pnlPct) rounded to cents.
+
+    Native floats; a position with any value within float error of a half cent is redone by
+    exact_figures, so results match the Decimal quantize either way.
+    """
+    current = (abs(mkt_val) if direction == "short" else mkt_val) / qty
+    current_price = round(current, 2)
+    pnl_raw = ((avg_price - current_price) if direction == "short" else (current_price - avg_price)) * qty
+    pnl = round(pnl_raw, 2)
+    cost_raw = avg_price * qty
+    cost = round(cost_raw, 2)
+    pct_raw = pnl / cost * 100 if cost else 0.0
+    if any(map(_near_half_cent, (avg_price, current, pnl_raw, cost_raw, pct_raw))):
+        return exact_figures(direction, qty, avg_price, mkt_val)
+    return round(avg_price, 2), current_price, pnl, round(pct_raw, 2)
+
+
+def resolve_stop(
+    symbol: str,
+    direction: str,
+    avg_price: float,
+    protective_orders: dict,
+    local_stops: dict,
+    short_limit_as_stop_fallback: bool = True,
+):
+    """Stop from working protective orders, else from local stops.json."""
+    candidates = protective_orders.get((symbol, direction), []) if isinstance(protective_orders, dict) else []
+    for candidate in candidates:
+        # Buckets hold only orders that close this side; a short-cover limit
+        # counts as a stop only above the entry price.
+        if candidate["kind"] == "stop":
+            return candidate["price"]
+        if short_limit_as_stop_fallback and candidate["price"] > avg_price:
+            return candidate["price"]
+
+    return resolve_local_stop(local_stops, symbol, direction)
+
+
 def parse_position(
     pos: dict,
     protective_orders: dict,
@@ -181,114 +316,155 @@ def parse_position(
 ) -> dict | None:
     """Parse Schwab position to our format. Handles common response shapes."""
     try:
-        inst = pos.get("instrument", {}) or pos.get("symbol", {})
-        if isinstance(inst, dict):
-            symbol = inst.get("symbol") or inst.get("ticker")
-        else:
-            symbol = str(inst)
-        if not symbol:
+        fields = position_fields(pos)
+        if fields is None:
             return None
+        symbol, direction, qty, avg_price, mkt_val = fields
 
-        long_qty = to_decimal(pos.get("longQuantity", 0) or pos.get("quantity", 0))
-        short_qty = to_decimal(pos.get("shortQuantity", 0))
-        if long_qty > 0:
-            direction = "long"
-            qty = long_qty
-        elif short_qty > 0:
-            direction = "short"
-            qty = short_qty
-        else:
-            return None
-
-        avg_price = to_decimal(pos.get("averagePrice", 0) or pos.get("costBasis", 0) or 0)
-        if direction == "short" and avg_price < 0:
-            avg_price = abs(avg_price)
-
-        mkt_val = pos.get("marketValue") or pos.get("currentMarketValue")
-        if isinstance(mkt_val, dict):
-            mkt_val = mkt_val.get("amount") or mkt_val.get("value")
-        mkt_val = to_decimal(mkt_val or 0)
-
-        if direction == "short":
-            current_price = (abs(mkt_val) / qty).quantize(Decimal("0.01")) if qty else Decimal("0")
-            pnl = ((avg_price - current_price) * qty).quantize(Decimal("0.01"))
-        else:
-            current_price = (mkt_val / qty).quantize(Decimal("0.01")) if qty else Decimal("0")
-            pnl = ((current_price - avg_price) * qty).quantize(Decimal("0.01"))
-        cost = (avg_price * qty).quantize(Decimal("0.01"))
-        pnl_pct = (pnl / cost * 100).quantize(Decimal("0.01")) if cost else Decimal("0")
-
-        candidates = protective_orders.get(symbol, []) if isinstance(protective_orders, dict) else []
-        stop_from_orders = None
-        for candidate in candidates:
-            kind = str(candidate.get("kind", "")).lower()
-            instruction = normalize_instruction(candidate.get("instruction"))
-            price = to_float(candidate.get("price"))
-            if price is None:
-                continue
-
-            if direction == "long":
-                if kind == "stop" and (not instruction or instruction in LONG_CLOSE_INSTRUCTIONS):
-                    stop_from_orders = price
-                    break
-            else:
-                if kind == "stop" and (not instruction or instruction in SHORT_CLOSE_INSTRUCTIONS):
-                    stop_from_orders = price
-                    break
-                if (
-                    kind == "limit"
-                    and short_limit_as_stop_fallback
-                    and (not instruction or instruction in SHORT_CLOSE_INSTRUCTIONS)
-                    and Decimal(str(price)) > avg_price
-                ):
-                    stop_from_orders = price
-                    break
-
-        stop = stop_from_orders
-        if stop is None:
-            stop = resolve_local_stop(local_stops, symbol, direction)
+        avg_cost, current_price, pnl, pnl_pct = position_figures(direction, qty, avg_price, mkt_val)
 
+        stop = resolve_stop(
+            symbol, direction, avg_price, protective_orders, local_stops, short_limit_as_stop_fallback
+        )
         return {
             "ticker": symbol,
             "quantity": int(qty),
             "direction": direction,
-            "avgCost": float(avg_price.quantize(Decimal("0.01"))),
-            "currentPrice": float(current_price),
-            "pnl": float(pnl),
-            "pnlPct": float(pnl_pct),
+            "avgCost": avg_cost,
+            "currentPrice": current_price,
+            "pnl": pnl,
+            "pnlPct": pnl_pct,
             "stop": stop,
         }
     except Exception:
         return None
 
 
-def main():
+def _round2(values) -> list[float]:
+    # Python's round() is correctly rounded; np.round scales by 100 first and can
+    # land a cent off, so keep the scalar path's rounding.
+    return [round(v, 2) for v in values.tolist()]
+
+
+def _near_half_cent_mask(np, values):
+    """Element-wise _near_half_cent."""
+    cents = np.abs(values) * 100
+    return np.abs(cents - np.floor(cents) - 0.5) <= 1e-9 * np.maximum(1.0, cents)
+
+
+def parse_positions(
+    raw_positions: list,
+    protective_orders: dict,
+    local_stops: dict,
+    short_limit_as_stop_fallback: bool = True,
+) -> list[dict]:
+    """Parse all Schwab positions. Large accounts do the price/P&L math column-wise in numpy."""
+    if len(raw_positions) < VECTORIZE_MIN_POSITIONS:
+        positions = []
+        for sec in raw_positions:
+            p = parse_position(
+                sec,
+                protective_orders,
+                local_stops,
+                short_limit_as_stop_fallback=short_limit_as_stop_fallback,
+            )
+            if p:
+                positions.append(p)
+        return positions
+
+    import numpy as np
+
+    rows = []
+    for sec in raw_positions:
+        try:
+            fields = position_fields(sec)
+            if fields is None:
+                continue
+            symbol, direction, _, avg_price, _ = fields
+            stop = resolve_stop(
+                symbol, direction, avg_price, protective_orders, local_stops, short_limit_as_stop_fallback
+            )
+        except Exception:
+            continue
+        rows.append((fields, stop))
+    if not rows:
+        return []
+
+    symbols, directions, qty, avg, mkt_val = zip(*(fields for fields, _ in rows))
+    short = np.array(directions) == "short"
+    qty = np.array(qty, dtype=np.float64)
+    avg = np.array(avg, dtype=np.float64)
+    mkt_val = np.array(mkt_val, dtype=np.float64)
+
+    current_raw = np.where(short, np.abs(mkt_val), mkt_val) / qty
+    current = np.array(_round2(current_raw))
+    pnl_raw = np.where(short, avg - current, current - avg) * qty
+    pnl = np.array(_round2(pnl_raw))
+    cost_raw = avg * qty
+    cost = np.array(_round2(cost_raw))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_raw = np.where(cost != 0, pnl / cost * 100, 0.0)
+    # Same fallback as position_figures: half-cent ties are redone in Decimal.
+    ties = np.zeros(len(rows), dtype=bool)
+    for values in (avg, current_raw, pnl_raw, cost_raw, pct_raw):
+        ties |= _near_half_cent_mask(np, values)
+
+    positions = []
+    for i, (symbol, direction, q, a, c, pl, pp, tie, (_, stop)) in enumerate(
+        zip(
+            symbols,
+            directions,
+            qty.tolist(),
+            avg.tolist(),
+            current.tolist(),
+            pnl.tolist(),
+            _round2(pct_raw),
+            ties.tolist(),
+            rows,
+        )
+    ):
+        if tie:
+            a, c, pl, pp = exact_figures(direction, q, a, float(mkt_val[i]))
+        else:
+            a = round(a, 2)
+        positions.append(
+            {
+                "ticker": symbol,
+                "quantity": int(q),
+                "direction": direction,
+                "avgCost": a,
+                "currentPrice": c,
+                "pnl": pl,
+                "pnlPct": pp,
+                "stop": stop,
+            }
+        )
+    return positions
+
+
+def _fetch() -> tuple[dict, bool]:
+    """(payload, fresh). fresh is True only for a live Schwab result worth caching."""
     api_key = os.environ.get("SCHWAB_API_KEY")
     app_secret = os.environ.get("SCHWAB_APP_SECRET")
     if not api_key or not app_secret:
         # Fallback to cache
         if OUTPUT_PATH.exists():
-            with open(OUTPUT_PATH) as f:
-                data = json.load(f)
+            data = _loads(OUTPUT_PATH.read_bytes())
             data["_cached"] = True
-            print(json.dumps(data))
-            return
+            return data, False
         out = {"error": "SCHWAB_API_KEY and SCHWAB_APP_SECRET required. Run auth_schwab.py first.", "positions": [], "summary": {}}
-        print(json.dumps(out))
-        sys.exit(1)
+        return out, False
 
     if not TOKEN_PATH.exists():
         out = {"error": f"Token not found at {TOKEN_PATH}. Run auth_schwab.py to authenticate.", "positions": [], "summary": {}}
-        print(json.dumps(out))
-        sys.exit(1)
+        return out, False
 
     try:
         from schwab.auth import client_from_token_file
         from schwab.client import Client
     except ImportError:
         out = {"error": "schwab-py required: pip install schwab-py", "positions": [], "summary": {}}
-        print(json.dumps(out))
-        sys.exit(1)
+        return out, False
 
     client = client_from_token_file(
         str(TOKEN_PATH), api_key=api_key, app_secret=app_secret
@@ -297,23 +473,20 @@ def main():
     resp = client.get_account_numbers()
     if resp.status_code != 200:
         out = {"error": f"Failed to get accounts: {resp.text}", "positions": [], "summary": {}}
-        print(json.dumps(out))
-        sys.exit(1)
+        return out, False
 
-    accounts = resp.json()
+    accounts = _loads(resp.content)
     if not accounts:
         out = {"error": "No accounts found", "positions": [], "summary": {}}
-        print(json.dumps(out))
-        sys.exit(1)
+        return out, False
 
     account_hash = accounts[0]["hashValue"]
     resp = client.get_account(account_hash, fields=[Client.Account.Fields.POSITIONS])
     if resp.status_code != 200:
         out = {"error": f"Failed to get positions: {resp.text}", "positions": [], "summary": {}}
-        print(json.dumps(out))
-        sys.exit(1)
+        return out, False
 
-    data = resp.json()
+    data = _loads(resp.content)
     rules = load_risk_rules().get("schwab_order_detection", {})
     short_limit_as_stop_fallback = bool(
         rules.get("short_limit_as_stop_fallback", True)
@@ -321,16 +494,12 @@ def main():
     protective_orders = fetch_protective_orders(client, account_hash)
     local_stops = load_stops()
 
-    positions = []
-    for sec in data.get("securitiesAccount", {}).get("positions", []):
-        p = parse_position(
-            sec,
-            protective_orders,
-            local_stops,
-            short_limit_as_stop_fallback=short_limit_as_stop_fallback,
-        )
-        if p:
-            positions.append(p)
+    positions = parse_positions(
+        data.get("securitiesAccount", {}).get("positions", []),
+        protective_orders,
+        local_stops,
+        short_limit_as_stop_fallback=short_limit_as_stop_fallback,
+    )
 
     # Summary from Schwab
     sec = data.get("securitiesAccount", {})
@@ -373,11 +542,26 @@ def main():
     if stderr_warnings:
         out["_stderr"] = "\n".join(stderr_warnings)
 
-    # Cache for risk-calculator and offline use
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(out, f, indent=2)
+    return out, True
 
-    print(json.dumps(out))
+
+def run() -> dict:
+    """Positions payload for in-process callers; refreshes the positions.json cache like the CLI."""
+    out, fresh = _fetch()
+    if fresh:
+        OUTPUT_PATH.write_bytes(_dumps_bytes(out))
+    return out
+
+
+def main():
+    out, fresh = _fetch()
+    # Cache for risk-calculator and offline use; compact, same bytes as stdout.
+    payload = _dumps_bytes(out)
+    if fresh:
+        OUTPUT_PATH.write_bytes(payload)
+    sys.stdout.buffer.write(payload + b"\n")
+    if "error" in out:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
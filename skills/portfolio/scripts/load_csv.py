@@ -7,6 +7,7 @@ Export from Schwab: Accounts > Positions > Export (top-right icon).
 
 Usage:
     python3 skills/portfolio/scripts/load_csv.py positions.csv
+    python3 skills/portfolio/scripts/load_csv.py exports/   # one CSV per account, merged
 
 Output:
     workspace/portfolio/positions.json  (same schema as get_positions.py)
@@ -14,34 +15,142 @@ Output:
 
 from __future__ import annotations
 
+import codecs
 import csv
 import json
+import mmap
+import os
+import re
 import sys
+import tempfile
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
+from typing import Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 POSITIONS_PATH = REPO_ROOT / "workspace" / "portfolio" / "positions.json"
+STOPS_PATH = REPO_ROOT / "workspace" / "portfolio" / "stops.json"
+
+# Fields read from each row, with the header spellings seen across export versions.
+_COLUMNS = (
+    ("Symbol",),
+    ("Qty", "Quantity"),
+    ("Price",),
+    ("Mkt Val",),
+    ("Day's Gain - Pct", "Day's Gain -\nPct"),
+    ("Total Gain - Pct", "Total Gain -\nPct"),
+)
+
+# Rows that carry a Mkt Val but no Qty without being cash (account totals are handled earlier).
+_NON_CASH_ROWS = frozenset({"PENDING ACTIVITY"})
+
+_CLEAN_RE = re.compile(r"[,%$]")
+# Zero spellings are common in exports; Decimal is immutable, so these are safe to share.
+_DECIMAL_CONSTANTS = {"0": Decimal(0), "0.00": Decimal(0)}
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps_bytes(obj) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
+
+
+def _dumps(obj) -> str:
+    return _dumps_bytes(obj).decode("utf-8")
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write via a temp file and rename, so readers never see a truncated positions.json."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False) as tmp:
+        tmp.write(data)
+    try:
+        # NamedTemporaryFile creates 0600; keep the usual positions file mode.
+        os.chmod(tmp.name, 0o644)
+        os.replace(tmp.name, path)
+    except OSError:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
 
 
 def _parse_decimal(value: str | None, default: str = "0") -> Decimal:
     if not value:
         return Decimal(default)
-    cleaned = value.strip().replace(",", "").replace("%", "").replace("$", "")
+    cleaned = _CLEAN_RE.sub("", value.strip())
+    cached = _DECIMAL_CONSTANTS.get(cleaned)
+    if cached is not None:
+        return cached
     try:
         return Decimal(cleaned)
     except InvalidOperation:
         return Decimal(default)
 
 
-def _is_cash_row(symbol: str) -> bool:
-    s = symbol.strip().upper()
-    return s in ("CASH & CASH INVESTMENTS", "SCHWAB ONE(R) BROKERAGE ACCOUNT", "")
+def _parse_float(value: str | None, default: float = 0.0) -> float:
+    """Like float(_parse_decimal(value)) for fields stored as floats, without building a Decimal."""
+    if not value:
+        return default
+    try:
+        return float(_CLEAN_RE.sub("", value))
+    except ValueError:
+        return default
 
 
-def _is_total_row(symbol: str) -> bool:
-    s = symbol.strip().upper()
-    return "ACCOUNT TOTAL" in s or "TOTAL" == s
+def _load_stops() -> dict:
+    """Manual stops from stops.json keyed by uppercase ticker; empty when missing or unreadable."""
+    if not STOPS_PATH.exists():
+        return {}
+    try:
+        stops_data = _loads(STOPS_PATH.read_bytes())
+        return {str(k).upper(): v for k, v in stops_data.items()}
+    except Exception:
+        return {}
+
+
+def _header_offset(buf: mmap.mmap) -> int | None:
+    """Byte offset of the first line naming both Symbol and Qty, or None."""
+    pos = buf.find(b"Symbol")
+    while pos != -1:
+        start = buf.rfind(b"\n", 0, pos) + 1
+        end = buf.find(b"\n", pos)
+        if end == -1:
+            end = len(buf)
+        if buf.find(b"Qty", start, end) != -1:
+            return start
+        pos = buf.find(b"Symbol", end)
+    return None
+
+
+def _column_indexes(headers: list[str]) -> list[int]:
+    """Row index per _COLUMNS field; absent fields map to the padding cell past the header."""
+    index = {name: i for i, name in enumerate(headers)}
+    missing = len(headers)
+    return [next((index[name] for name in names if name in index), missing) for names in _COLUMNS]
+
+
+def _lines_from_header(csv_path: Path) -> Iterator[str]:
+    """Decoded lines of csv_path from the column header row on, one at a time; empty if none."""
+    with open(csv_path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return
+        with buf:
+            header_start = _header_offset(buf)
+            if header_start is None:
+                return
+            buf.seek(header_start)
+            # Skip the BOM when the header is the first line.
+            if buf.read(len(codecs.BOM_UTF8)) != codecs.BOM_UTF8:
+                buf.seek(header_start)
+            for line in iter(buf.readline, b""):
+                yield line.decode("utf-8")
 
 
 def load_csv(csv_path: Path) -> dict:
@@ -56,38 +165,42 @@ def load_csv(csv_path: Path) -> dict:
     total_value = Decimal("0")
     cash = Decimal("0")
     daily_pnl_pct = None
-
-    with open(csv_path, newline="", encoding="utf-8-sig") as f:
-        # Schwab CSVs sometimes have a header line before the column names.
-        # Read until we find the row containing "Symbol".
-        lines = f.readlines()
-
-    header_idx = None
-    for i, line in enumerate(lines):
-        if "Symbol" in line and "Qty" in line:
-            header_idx = i
-            break
-
-    if header_idx is None:
+    # Schwab CSVs sometimes have a header line before the column names.
+    # Stream rows from the line containing "Symbol" instead of loading every line.
+    reader = csv.reader(_lines_from_header(csv_path))
+    headers = next(reader, None)
+    if headers is None:
         return {"error": "Could not find header row in CSV. Expected columns: Symbol, Qty, Price, Mkt Val"}
 
-    reader = csv.DictReader(lines[header_idx:])
+    # Resolve columns once, then index rows positionally.
+    symbol_i, qty_i, price_i, mkt_val_i, day_pct_i, total_pct_i = _column_indexes(headers)
+    width = len(headers) + 1
+    # Manual stops from stops.json are applied as each position is built.
+    stops_map = _load_stops()
 
     for row in reader:
-        symbol = (row.get("Symbol") or "").strip()
+        if len(row) < width:
+            row += [""] * (width - len(row))
+        symbol = row[symbol_i].strip()
         if not symbol:
             continue
+        # Uppercased once: used by the total check and as the emitted ticker.
+        ticker = symbol.upper()
 
-        if _is_total_row(symbol):
+        if "ACCOUNT TOTAL" in ticker or ticker == "TOTAL":
             # Account total row: capture total market value and daily P&L
-            total_value = _parse_decimal(row.get("Mkt Val"))
-            raw_day_pct = row.get("Day's Gain - Pct") or row.get("Day's Gain -\nPct", "")
+            total_value = _parse_decimal(row[mkt_val_i])
+            raw_day_pct = row[day_pct_i]
             if raw_day_pct.strip():
-                daily_pnl_pct = float(_parse_decimal(raw_day_pct))
+                daily_pnl_pct = _parse_float(raw_day_pct)
             continue
 
-        if _is_cash_row(symbol):
-            cash = _parse_decimal(row.get("Mkt Val"))
+        # Cash-like rows (cash, sweep, money market) carry a market value but no quantity,
+        # whatever the export calls them; pending activity has the same shape but is not cash.
+        qty_cell = row[qty_i].strip()
+        mkt_val = row[mkt_val_i]
+        if qty_cell in ("", "--") and mkt_val.strip() and ticker not in _NON_CASH_ROWS:
+            cash += _parse_decimal(mkt_val)
             continue
 
         # Skip option rows (contain spaces and special chars like C/P + strike)
@@ -95,39 +208,27 @@ def load_csv(csv_path: Path) -> dict:
         if len(symbol) > 6 or " " in symbol:
             continue
 
-        qty_raw = _parse_decimal(row.get("Qty") or row.get("Quantity", "0"))
+        qty_raw = _parse_decimal(qty_cell)
         if qty_raw == 0:
             continue
 
         direction = "long" if qty_raw > 0 else "short"
         quantity = int(abs(qty_raw))
-        current_price = float(_parse_decimal(row.get("Price", "0")))
-        pnl_pct_raw = row.get("Total Gain - Pct") or row.get("Total Gain -\nPct", "")
-        pnl_pct = float(_parse_decimal(pnl_pct_raw)) if pnl_pct_raw.strip() else None
+        current_price = _parse_float(row[price_i])
+        pnl_pct_raw = row[total_pct_i]
+        pnl_pct = _parse_float(pnl_pct_raw) if pnl_pct_raw.strip() else None
 
         positions.append({
-            "ticker": symbol.upper(),
+            "ticker": ticker,
             "quantity": quantity,
             "direction": direction,
             "avgCost": None,
             "currentPrice": current_price,
             "pnl": None,
             "pnlPct": pnl_pct,
-            "stop": None,
+            "stop": stops_map.get(ticker),
         })
 
-    # Merge manual stops from stops.json if present
-    stops_path = REPO_ROOT / "workspace" / "portfolio" / "stops.json"
-    if stops_path.exists():
-        try:
-            stops_data = json.loads(stops_path.read_text())
-            stops_map = {str(k).upper(): v for k, v in stops_data.items()}
-            for p in positions:
-                if p["ticker"] in stops_map:
-                    p["stop"] = stops_map[p["ticker"]]
-        except Exception:
-            pass
-
     return {
         "positions": positions,
         "summary": {
@@ -139,27 +240,101 @@ def load_csv(csv_path: Path) -> dict:
     }
 
 
+def _basis(value: float, pct: float | None, short: bool = False) -> float | None:
+    """Starting value behind a current value and its gain %, e.g. cost basis from market value."""
+    if pct is None:
+        return None
+    # A short gains as the price falls, so its value is below basis when pct is positive.
+    growth = 1 - pct / 100 if short else 1 + pct / 100
+    return abs(value) / growth if growth > 0 else None
+
+
+def _weighted_pct(parts: list[tuple[float | None, float | None]]) -> float | None:
+    """Basis-weighted average of (basis, pct) pairs, or None when any basis is unknown."""
+    if any(basis is None for basis, _ in parts):
+        return None
+    weight = sum(basis for basis, _ in parts)
+    if not weight:
+        return None
+    return round(sum(basis * pct for basis, pct in parts) / weight, 2)
+
+
+def merge_results(results: list[dict]) -> dict:
+    """Combine per-account load_csv results. Same ticker and direction become one position."""
+    merged: dict[tuple[str, str], dict] = {}
+    pct_parts: dict[tuple[str, str], list[tuple[float | None, float | None]]] = {}
+    for result in results:
+        for p in result["positions"]:
+            key = (p["ticker"], p["direction"])
+            # Weight each account's gain % by its cost basis, so the merge is total gain / total cost.
+            basis = _basis(p["quantity"] * p["currentPrice"], p["pnlPct"], short=p["direction"] == "short")
+            part = (basis, p["pnlPct"])
+            if key in merged:
+                merged[key]["quantity"] += p["quantity"]
+                pct_parts[key].append(part)
+            else:
+                merged[key] = dict(p)
+                pct_parts[key] = [part]
+    for key, p in merged.items():
+        if len(pct_parts[key]) > 1:
+            p["pnlPct"] = _weighted_pct(pct_parts[key])
+
+    positions = list(merged.values())
+    summaries = [r["summary"] for r in results]
+    # Accounts without a day's gain are left out; the rest are weighted by yesterday's value.
+    daily_parts = [
+        (_basis(s["totalValue"], s["dailyPnlPct"]), s["dailyPnlPct"])
+        for s in summaries
+        if s["dailyPnlPct"] is not None
+    ]
+    return {
+        "positions": positions,
+        "summary": {
+            "totalValue": round(sum(s["totalValue"] for s in summaries), 2),
+            "cash": round(sum(s["cash"] for s in summaries), 2),
+            "dailyPnlPct": _weighted_pct(daily_parts),
+        },
+        "_source": "csv",
+    }
+
+
+def load_csv_dir(dir_path: Path) -> dict:
+    """Parse every .csv in dir_path (one export per account) and merge them."""
+    # Suffix compared case-insensitively: exports are often saved as .CSV.
+    files = sorted(p for p in dir_path.iterdir() if p.is_file() and p.suffix.lower() == ".csv")
+    if not files:
+        return {"error": f"No CSV files found in {dir_path}"}
+    # Serial: a handful of account exports parse faster than a process pool starts.
+    results = [load_csv(path) for path in files]
+    for path, result in zip(files, results):
+        if "error" in result:
+            # A partial portfolio would understate exposure, so fail the whole load.
+            return {"error": f"{path.name}: {result['error']}"}
+    return merge_results(results)
+
+
 def main() -> int:
     if len(sys.argv) < 2:
-        print(json.dumps({"error": "Usage: load_csv.py <path-to-schwab-export.csv>"}))
+        print(_dumps({"error": "Usage: load_csv.py <path-to-schwab-export.csv | directory-of-exports>"}))
         return 1
 
     csv_path = Path(sys.argv[1])
     if not csv_path.exists():
-        print(json.dumps({"error": f"File not found: {csv_path}"}))
+        print(_dumps({"error": f"File not found: {csv_path}"}))
         return 1
 
-    result = load_csv(csv_path)
+    result = load_csv_dir(csv_path) if csv_path.is_dir() else load_csv(csv_path)
     if "error" in result:
-        print(json.dumps(result))
+        print(_dumps(result))
         return 1
 
     POSITIONS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    POSITIONS_PATH.write_text(json.dumps(result, indent=2))
+    # Compact like get_positions.py; the file is machine-read.
+    _atomic_write_bytes(POSITIONS_PATH, _dumps_bytes(result))
 
     n = len(result.get("positions", []))
     total = result.get("summary", {}).get("totalValue", 0)
-    print(json.dumps({
+    print(_dumps({
         "status": "ok",
         "positions": n,
         "totalValue": total,
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Shared risk-rules config, positions loading and JSON helpers for risk-calculator scripts."""
+
+from __future__ import annotations
+
+import json
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+# Add repo scripts dir for the shared config loader
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from config_cache import load_yaml_cached  # noqa: E402
+
+CONFIG_PATH = REPO_ROOT / "config" / "risk-rules.yaml"
+
+
+def json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def json_dumps(obj) -> str:
+    return orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)
+
+
+def load_risk_rules() -> dict:
+    return load_yaml_cached(CONFIG_PATH)
+
+
+@lru_cache(maxsize=1)
+def _parse_positions(path_str: str, mtime_ns: int, size: int) -> dict:
+    data = json_loads(Path(path_str).read_bytes())
+    return data if isinstance(data, dict) else {}
+
+
+def load_positions_data(path: Path) -> dict | None:
+    """Parsed positions.json, or None when missing.
+
+    Keyed on mtime and size, so scripts run in one process (run_morning_brief) share a
+    single parse until the file is rewritten. The dict is shared: treat it as read-only.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return _parse_positions(str(path), st.st_mtime_ns, st.st_size)
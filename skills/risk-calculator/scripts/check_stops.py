@@ -1,83 +1,108 @@
 #!/usr/bin/env python3
 """
-Check positions for stop proximity. Uses decimal for deterministic money math.
+Check positions for stop proximity. Uses integer micro-dollars for deterministic money math.
 Reads positions from workspace/portfolio/positions.json or stdin.
 """
 
-import json
 import sys
-from decimal import Decimal
 from pathlib import Path
 
+import numpy as np
+
+from _config import json_dumps, json_loads, load_positions_data, load_risk_rules
+
 REPO_ROOT = Path(__file__).resolve().parents[3]
-CONFIG_PATH = REPO_ROOT / "config" / "risk-rules.yaml"
 POSITIONS_PATH = REPO_ROOT / "workspace" / "portfolio" / "positions.json"
+# Fixed-point price scale: exact for quotes with up to 6 decimal places.
+MICROS = 1_000_000
 
 
 def load_config():
     try:
-        import yaml
-        if CONFIG_PATH.exists():
-            with open(CONFIG_PATH) as f:
-                cfg = yaml.safe_load(f) or {}
-                return cfg.get("hard_alerts", {}).get("stop_approaching_pct", 5.0)
+        return load_risk_rules().get("hard_alerts", {}).get("stop_approaching_pct", 5.0)
     except Exception:
-        pass
-    return 5.0
+        return 5.0
+
+
+def to_micros(value) -> int | None:
+    try:
+        return round(float(value) * MICROS)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def div_round(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """Elementwise integer num / den rounded half-even (den > 0), matching Decimal.quantize."""
+    q, r = np.divmod(num, den)
+    return q + ((2 * r > den) | ((2 * r == den) & (q % 2 == 1)))
+
+
+def load_positions_file() -> list:
+    data = load_positions_data(POSITIONS_PATH)
+    return data.get("positions", []) if data is not None else []
 
 
 def load_positions():
     if not sys.stdin.isatty():
-        data = json.load(sys.stdin)
-        return data.get("positions", data) if isinstance(data, dict) else data
-    if POSITIONS_PATH.exists():
-        with open(POSITIONS_PATH) as f:
-            data = json.load(f)
-            return data.get("positions", [])
-    return []
+        raw = sys.stdin.buffer.read()
+        # Empty stdin (cron, /dev/null) means nothing was piped in; use the file.
+        if raw.strip():
+            data = json_loads(raw)
+            return data.get("positions", data) if isinstance(data, dict) else data
+    return load_positions_file()
 
 
-def main():
-    threshold_pct = Decimal(str(load_config()))
-    positions = load_positions()
+def run(positions: list | None = None) -> dict:
+    """Stop alerts for positions (default: positions.json). Never reads stdin."""
+    threshold = float(load_config())
+    if positions is None:
+        positions = load_positions_file()
 
     if not positions:
-        print(json.dumps({"alerts": [], "error": "No positions"}))
-        return
+        return {"alerts": [], "error": "No positions"}
 
-    alerts = []
+    # Parse once, then classify every position with array masks.
+    rows, cur_list, stop_list, short_list = [], [], [], []
     for p in positions:
-        ticker = p.get("ticker", "?")
-        direction = str(p.get("direction", "long")).strip().lower()
         stop = p.get("stop")
         if stop is None:
             continue
-        try:
-            current = Decimal(str(p.get("currentPrice", 0)))
-            stop_dec = Decimal(str(stop))
-        except Exception:
-            continue
-        if current <= 0 or stop_dec <= 0:
+        current_m = to_micros(p.get("currentPrice", 0))
+        stop_m = to_micros(stop)
+        if current_m is None or stop_m is None or current_m <= 0 or stop_m <= 0:
             continue
+        rows.append(p)
+        cur_list.append(current_m)
+        stop_list.append(stop_m)
+        short_list.append(str(p.get("direction", "long")).strip().lower() == "short")
+
+    current = np.array(cur_list, dtype=np.int64)
+    stops = np.array(stop_list, dtype=np.int64)
+    short = np.array(short_list, dtype=bool)
+
+    # Distance to stop in hundredths of a percent of the current price, rounded half-even
+    # like Decimal.quantize. Only this reported figure is rounded; hit compares micro-dollar prices.
+    bp_to_stop = div_round(np.where(short, stops - current, current - stops) * 10000, current)
+    hit = np.where(short, current >= stops, current <= stops)
+    approaching = ~hit & (bp_to_stop <= threshold * 100)
 
-        if direction == "short":
-            pct_to_stop = ((stop_dec - current) / current * 100).quantize(Decimal("0.01"))
-            status = "hit" if current >= stop_dec else ("approaching" if float(pct_to_stop) <= threshold_pct else "ok")
-        else:
-            pct_to_stop = ((current - stop_dec) / current * 100).quantize(Decimal("0.01"))
-            status = "hit" if current <= stop_dec else ("approaching" if float(pct_to_stop) <= threshold_pct else "ok")
-
-        if status != "ok":
-            alerts.append({
-                "ticker": ticker,
-                "direction": direction,
-                "currentPrice": float(current),
-                "stop": float(stop_dec),
-                "pctToStop": float(pct_to_stop),
-                "status": status,
-            })
-
-    print(json.dumps({"alerts": alerts}))
+    alerts = [
+        {
+            "ticker": str(rows[i].get("ticker", "?")),
+            "direction": str(rows[i].get("direction", "long")).strip().lower(),
+            "currentPrice": float(rows[i].get("currentPrice")),
+            "stop": float(rows[i]["stop"]),
+            "pctToStop": int(bp_to_stop[i]) / 100,
+            "status": "hit" if hit[i] else "approaching",
+        }
+        for i in np.flatnonzero(hit | approaching)
+    ]
+
+    return {"alerts": alerts}
+
+
+def main():
+    print(json_dumps(run(load_positions())))
 
 
 if __name__ == "__main__":
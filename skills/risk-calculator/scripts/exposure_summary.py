@@ -1,65 +1,62 @@
 #!/usr/bin/env python3
 """
-Portfolio exposure summary. Uses decimal for deterministic math.
+Portfolio exposure summary. Vectorized float64 math over all positions.
 Reads from workspace/portfolio/positions.json.
 """
 
-import json
-from decimal import Decimal
 from pathlib import Path
 
+import numpy as np
+
+from _config import json_dumps, load_positions_data, load_risk_rules
+
 REPO_ROOT = Path(__file__).resolve().parents[3]
 POSITIONS_PATH = REPO_ROOT / "workspace" / "portfolio" / "positions.json"
-CONFIG_PATH = REPO_ROOT / "config" / "risk-rules.yaml"
 
 
-def load_concentration_threshold() -> Decimal:
+def load_concentration_threshold() -> float:
     try:
-        import yaml
-
-        if CONFIG_PATH.exists():
-            with open(CONFIG_PATH) as f:
-                cfg = yaml.safe_load(f) or {}
-                soft_flags = cfg.get("soft_flags", {}) if isinstance(cfg, dict) else {}
-                value = soft_flags.get("concentration_warn_pct", 20.0)
-                return Decimal(str(value))
+        soft_flags = load_risk_rules().get("soft_flags", {})
+        return float(soft_flags.get("concentration_warn_pct", 20.0))
     except Exception:
-        pass
-    return Decimal("20.0")
+        return 20.0
 
 
-def main():
-    if not POSITIONS_PATH.exists():
-        print(json.dumps({"positions": 0, "totalValue": 0, "reEvalFlags": []}))
-        return
-
-    with open(POSITIONS_PATH) as f:
-        data = json.load(f)
+def run() -> dict:
+    data = load_positions_data(POSITIONS_PATH)
+    if data is None:
+        return {"positions": 0, "totalValue": 0, "reEvalFlags": []}
 
     positions = data.get("positions", [])
     summary = data.get("summary", {})
-    total = Decimal(str(summary.get("totalValue", 0)))
+    total = float(summary.get("totalValue") or 0)
 
     threshold = load_concentration_threshold()
     re_eval = []
-    if total > 0:
-        for p in positions:
-            market_value = p.get("marketValue")
-            asset_type = (p.get("instrument") or {}).get("assetType")
-            if market_value is not None:
-                mv = Decimal(str(market_value))
-            elif asset_type == "EQUITY" or market_value is None:
-                mv = Decimal(str(p.get("quantity", 0))) * Decimal(str(p.get("currentPrice", 0)))
-            pct = (mv / total * 100).quantize(Decimal("0.1"))
-            if pct > threshold:
-                re_eval.append({"ticker": p.get("ticker"), "weightPct": float(pct), "reason": "concentration"})
-
-    out = {
+    if total > 0 and positions:
+        n = len(positions)
+        qty = np.fromiter((float(p.get("quantity") or 0) for p in positions), dtype=np.float64, count=n)
+        price = np.fromiter((float(p.get("currentPrice") or 0) for p in positions), dtype=np.float64, count=n)
+        # NaN marks positions without a reported marketValue; those fall back to qty * price.
+        reported = np.fromiter(
+            (np.nan if p.get("marketValue") is None else float(p["marketValue"]) for p in positions),
+            dtype=np.float64,
+            count=n,
+        )
+        mv = np.where(np.isnan(reported), qty * price, reported)
+        pct = np.round(mv / total * 100, 1)
+        for i in np.flatnonzero(pct > threshold):
+            re_eval.append({"ticker": str(positions[i].get("ticker")), "weightPct": float(pct[i]), "reason": "concentration"})
+
+    return {
         "positions": len(positions),
-        "totalValue": float(total),
+        "totalValue": total,
         "reEvalFlags": re_eval,
     }
-    print(json.dumps(out))
+
+
+def main():
+    print(json_dumps(run()))
 
 
 if __name__ == "__main__":
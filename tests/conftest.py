@@ -0,0 +1,9 @@
+"""Put every script directory on sys.path so tests import scripts by module name."""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+for scripts_dir in (REPO_ROOT / "scripts", *sorted(REPO_ROOT.glob("skills/*/scripts"))):
+    sys.path.insert(0, str(scripts_dir))
@@ -0,0 +1,95 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import check_stops  # noqa: E402
+
+THRESHOLD = 5.0
+
+
+def decimal_reference(positions, threshold_pct=THRESHOLD):
+    """The original per-position Decimal loop."""
+    threshold = Decimal(str(threshold_pct))
+    alerts = []
+    for p in positions:
+        direction = str(p.get("direction", "long")).strip().lower()
+        stop = p.get("stop")
+        if stop is None:
+            continue
+        try:
+            current = Decimal(str(p.get("currentPrice", 0)))
+            stop_dec = Decimal(str(stop))
+        except Exception:
+            continue
+        if current <= 0 or stop_dec <= 0:
+            continue
+        if direction == "short":
+            pct = ((stop_dec - current) / current * 100).quantize(Decimal("0.01"))
+            hit = current >= stop_dec
+        else:
+            pct = ((current - stop_dec) / current * 100).quantize(Decimal("0.01"))
+            hit = current <= stop_dec
+        status = "hit" if hit else ("approaching" if float(pct) <= threshold else "ok")
+        if status != "ok":
+            alerts.append({
+                "ticker": p.get("ticker", "?"),
+                "direction": direction,
+                "currentPrice": float(current),
+                "stop": float(stop_dec),
+                "pctToStop": float(pct),
+                "status": status,
+            })
+    return {"alerts": alerts}
+
+
+@pytest.fixture(autouse=True)
+def fixed_threshold(monkeypatch):
+    monkeypatch.setattr(check_stops, "load_config", lambda: THRESHOLD)
+
+
+def random_positions(rng, count):
+    positions = []
+    for i in range(count):
+        current = round(rng.uniform(0.5, 800), rng.choice([2, 2, 3, 4]))
+        stop = round(current * (1 + rng.uniform(-0.1, 0.1)), rng.choice([2, 3]))
+        if rng.random() < 0.05:
+            stop = None
+        elif rng.random() < 0.03:
+            current = rng.choice([None, "abc", 0, -5])
+        direction = rng.choice(["long", "short", "LONG", " short "])
+        positions.append({"ticker": f"T{i}", "direction": direction, "currentPrice": current, "stop": stop})
+    return positions
+
+
+def test_run_matches_decimal_reference():
+    rng = random.Random(7)
+    for _ in range(20):
+        positions = random_positions(rng, 300)
+        assert check_stops.run(positions) == decimal_reference(positions)
+
+
+@pytest.mark.parametrize(
+    "position, pct, status",
+    [
+        ({"currentPrice": 100, "stop": 95}, 5.0, "approaching"),
+        ({"currentPrice": 200, "stop": 190.01}, 5.0, "approaching"),
+        ({"currentPrice": 8, "stop": 7.6004}, 5.0, "approaching"),
+        ({"currentPrice": 10.004, "stop": 10.0}, 0.04, "approaching"),
+        ({"currentPrice": 80, "stop": 84.004, "direction": "short"}, 5.0, "approaching"),
+        ({"currentPrice": 95, "stop": 95}, 0.0, "hit"),
+        ({"currentPrice": 100, "stop": 105, "direction": "short"}, 5.0, "approaching"),
+        ({"currentPrice": 105, "stop": 100, "direction": "short"}, -4.76, "hit"),
+    ],
+)
+def test_threshold_and_rounding_ties(position, pct, status):
+    [alert] = check_stops.run([{"ticker": "X", **position}])["alerts"]
+    assert (alert["pctToStop"], alert["status"]) == (pct, status)
+    assert check_stops.run([{"ticker": "X", **position}]) == decimal_reference([{"ticker": "X", **position}])
+
+
+def test_no_alerts_and_no_positions():
+    assert check_stops.run([{"ticker": "X", "currentPrice": 100, "stop": 80}]) == {"alerts": []}
+    assert check_stops.run([]) == {"alerts": [], "error": "No positions"}
@@ -0,0 +1,55 @@
+import pytest
+
+requests = pytest.importorskip("requests")
+
+import get_news  # noqa: E402
+
+API_KEY = "sk-test-1234567890"
+
+
+class FakeSession:
+    """Stands in for get_news._SESSION, failing each GET the way requests does."""
+
+    def __init__(self, fail):
+        self.fail = fail
+
+    def get(self, url, timeout=None):
+        return self.fail(url)
+
+
+def _http_401(url):
+    resp = requests.Response()
+    resp.status_code = 401
+    resp.reason = "Unauthorized"
+    resp.url = url
+    resp._content = b'{"status": "error"}'
+    return resp
+
+
+def _connection_error(url):
+    raise requests.ConnectionError(f"Max retries exceeded with url: {url}")
+
+
+@pytest.mark.parametrize("source", ["newsapi", "finnhub"])
+@pytest.mark.parametrize("fail", [_http_401, _connection_error])
+def test_api_key_never_reaches_errors(monkeypatch, source, fail):
+    monkeypatch.setenv("NEWS_API_KEY", API_KEY)
+    monkeypatch.setenv("NEWS_API_SOURCE", source)
+    monkeypatch.setattr(get_news, "_SESSION", FakeSession(fail))
+
+    out = get_news.run(["AAPL", "MSFT"], no_cache=True)
+
+    assert len(out["errors"]) == 2
+    assert all(API_KEY not in error for error in out["errors"])
+    assert API_KEY not in get_news._dumps(out)
+
+
+def test_http_error_reports_status_and_reason(monkeypatch):
+    monkeypatch.setattr(get_news, "_SESSION", FakeSession(_http_401))
+    with pytest.raises(RuntimeError, match=r"^HTTP Error 401: Unauthorized$"):
+        get_news.fetch_json(f"https://newsapi.org/v2/everything?apiKey={API_KEY}")
+
+
+def test_session_pool_covers_the_fan_out():
+    adapter = get_news._make_session().get_adapter("https://newsapi.org")
+    assert adapter._pool_maxsize == get_news.MAX_FETCH_WORKERS
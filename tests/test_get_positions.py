@@ -0,0 +1,84 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import get_positions  # noqa: E402
+
+CENT = Decimal("0.01")
+
+
+def decimal_reference(direction, qty, avg, mkt_val):
+    """The pre-float figures: Decimal(str(v)) inputs, half-even quantize to cents."""
+    qty, avg, mkt_val = (Decimal(str(v)) for v in (qty, avg, mkt_val))
+    if direction == "short":
+        current = (abs(mkt_val) / qty).quantize(CENT)
+        pnl = ((avg - current) * qty).quantize(CENT)
+    else:
+        current = (mkt_val / qty).quantize(CENT)
+        pnl = ((current - avg) * qty).quantize(CENT)
+    cost = (avg * qty).quantize(CENT)
+    pnl_pct = (pnl / cost * 100).quantize(CENT) if cost else Decimal("0")
+    return {
+        "quantity": int(qty),
+        "avgCost": float(avg.quantize(CENT)),
+        "currentPrice": float(current),
+        "pnl": float(pnl),
+        "pnlPct": float(pnl_pct),
+    }
+
+
+def random_position(rng, i):
+    qty = rng.choice([1, 3, 7, 10, 25, 100, 333, 1000, 2.5, 0.5])
+    avg = round(rng.uniform(0.5, 900), rng.choice([2, 4]))
+    mkt_val = round(qty * round(avg * rng.uniform(0.5, 1.6), 2), 2)
+    if rng.random() < 0.3:
+        return {"instrument": {"symbol": f"S{i}"}, "shortQuantity": qty, "averagePrice": avg, "marketValue": -mkt_val}
+    return {"instrument": {"symbol": f"L{i}"}, "longQuantity": qty, "averagePrice": avg, "marketValue": mkt_val}
+
+
+def expected(pos):
+    direction = "short" if "shortQuantity" in pos else "long"
+    qty = pos["shortQuantity"] if direction == "short" else pos["longQuantity"]
+    ref = decimal_reference(direction, qty, pos["averagePrice"], pos["marketValue"])
+    return {"ticker": pos["instrument"]["symbol"], "direction": direction, "stop": None, **ref}
+
+
+@pytest.mark.parametrize("count", [get_positions.VECTORIZE_MIN_POSITIONS - 1, 400])
+def test_parse_positions_matches_decimal_math(count):
+    rng = random.Random(count)
+    raw = [random_position(rng, i) for i in range(count)]
+    assert get_positions.parse_positions(raw, {}, {}) == [expected(p) for p in raw]
+
+
+def test_half_cent_ties_round_half_even():
+    pos = {"instrument": {"symbol": "X"}, "longQuantity": 2.5, "averagePrice": 391.2, "marketValue": 523.775}
+    assert get_positions.parse_position(pos, {}, {}) == expected(pos)
+    assert expected(pos)["pnl"] == -454.22
+
+
+BAD_ROWS = [
+    {"instrument": {"symbol": "INF"}, "longQuantity": "inf", "averagePrice": 10, "marketValue": 100},
+    {"instrument": {"symbol": "NINF"}, "shortQuantity": "inf", "averagePrice": 10, "marketValue": -100},
+    {"instrument": {"symbol": "NANAVG"}, "longQuantity": 5, "averagePrice": "nan", "marketValue": 100},
+    {"instrument": {"symbol": "INFMV"}, "longQuantity": 5, "averagePrice": 10, "marketValue": "inf"},
+    {"instrument": {"symbol": "TEXT"}, "longQuantity": "lots", "averagePrice": 10, "marketValue": 100},
+    {"instrument": {"symbol": "FLAT"}, "longQuantity": 0, "averagePrice": 10, "marketValue": 0},
+    {"instrument": {}, "longQuantity": 5, "averagePrice": 10, "marketValue": 50},
+]
+
+
+def test_scalar_and_vector_paths_agree_with_bad_rows():
+    rng = random.Random(7)
+    raw = [random_position(rng, i) for i in range(60)]
+    for i, bad in enumerate(BAD_ROWS):
+        raw.insert(i * 9, bad)
+    scalar = [p for p in (get_positions.parse_position(pos, {}, {}) for pos in raw) if p]
+    vector = get_positions.parse_positions(raw, {}, {})
+    assert len(raw) >= get_positions.VECTORIZE_MIN_POSITIONS
+    assert vector == scalar
+    assert {p["ticker"] for p in vector}.isdisjoint(
+        {"INF", "NINF", "NANAVG", "INFMV", "TEXT", "FLAT"}
+    )
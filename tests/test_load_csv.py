@@ -0,0 +1,90 @@
+import pytest
+
+import load_csv
+
+EXPORT = """﻿"Positions for account Individual ...123 as of 09:30 AM ET, 2026/10/14"
+
+"Symbol","Description","Qty","Price","Price Change %","Mkt Val","Day's Gain - Pct","Total Gain - Pct","% Of Account","Security Type"
+"aapl","Apple Inc","10","$190.50","1.2%","$1,905.00","0.81%","12.34%","3%","Equity"
+"TSLA","Tesla Inc","-5","$250.00","-1.0%","-$1,250.00","-0.24%","-8.5%","2%","Equity"
+"MSFT","Microsoft","1,200","$410.25","0.5%","$492,300.00","1.1%","N/A","60%","Equity"
+"NVDA","Nvidia","0","$120.00","0%","$0.00","","","0%","Equity"
+"SPY 12/20/2026 500.00 C","Call","1","$5.00","","$500.00","","","1%","Option"
+"Cash & Cash Investments","--","--","--","","$2,500.00","","","5%","Cash"
+"Pending Activity","","","","","$250.00","","","",""
+"Account Total","","","","","$497,455.00","0.95%","","100%",""
+"""
+
+
+@pytest.fixture
+def no_stops(tmp_path, monkeypatch):
+    monkeypatch.setattr(load_csv, "STOPS_PATH", tmp_path / "stops.json")
+    return tmp_path / "stops.json"
+
+
+def _position(ticker, quantity, direction, price, pnl_pct, stop=None):
+    return {
+        "ticker": ticker,
+        "quantity": quantity,
+        "direction": direction,
+        "avgCost": None,
+        "currentPrice": price,
+        "pnl": None,
+        "pnlPct": pnl_pct,
+        "stop": stop,
+    }
+
+
+def test_load_csv_matches_original_parser(tmp_path, no_stops):
+    # Expected values are what the original line-by-line parser produced for this export.
+    no_stops.write_text('{"aapl": 175.0}')
+    path = tmp_path / "export.csv"
+    path.write_text(EXPORT, encoding="utf-8")
+    assert load_csv.load_csv(path) == {
+        "positions": [
+            _position("AAPL", 10, "long", 190.5, 12.34, stop=175.0),
+            _position("TSLA", 5, "short", 250.0, -8.5),
+            _position("MSFT", 1200, "long", 410.25, 0.0),
+        ],
+        "summary": {"totalValue": 497455.0, "cash": 2500.0, "dailyPnlPct": 0.95},
+        "_source": "csv",
+    }
+
+
+def _account(positions, total_value, daily_pct, cash=0.0):
+    return {
+        "positions": positions,
+        "summary": {"totalValue": total_value, "cash": cash, "dailyPnlPct": daily_pct},
+        "_source": "csv",
+    }
+
+
+def test_merge_weights_gain_pct_by_cost_basis():
+    # 10 @ 150 bought at 100 (+50%) and 10 @ 150 bought at 150 (0%): cost 2500, gain 500.
+    merged = load_csv.merge_results([
+        _account([_position("AAPL", 10, "long", 150.0, 50.0)], 1500.0, 2.0, cash=100.0),
+        _account([_position("AAPL", 10, "long", 150.0, 0.0)], 3000.0, 0.0, cash=50.0),
+    ])
+    assert merged["positions"] == [_position("AAPL", 20, "long", 150.0, 20.0)]
+    # Yesterday's values were 1500 / 1.02 and 3000, so the day's gain is 29.41 on 4470.59.
+    assert merged["summary"] == {"totalValue": 4500.0, "cash": 150.0, "dailyPnlPct": 0.66}
+
+
+def test_merge_short_cost_basis():
+    # Shorted 10 @ 100 now 80 (+20%) and 10 @ 80 now 80 (0%): proceeds 1800, gain 200.
+    merged = load_csv.merge_results([
+        _account([_position("TSLA", 10, "short", 80.0, 20.0)], 800.0, None),
+        _account([_position("TSLA", 10, "short", 80.0, 0.0)], 800.0, None),
+    ])
+    assert merged["positions"][0]["pnlPct"] == 11.11
+    assert merged["summary"]["dailyPnlPct"] is None
+
+
+def test_merge_unknown_gain_pct_is_none():
+    merged = load_csv.merge_results([
+        _account([_position("AAPL", 10, "long", 150.0, 50.0)], 1500.0, 1.0),
+        _account([_position("AAPL", 5, "long", 150.0, None)], 750.0, None),
+    ])
+    assert merged["positions"][0]["pnlPct"] is None
+    assert merged["positions"][0]["quantity"] == 15
+    assert merged["summary"]["dailyPnlPct"] == 1.0
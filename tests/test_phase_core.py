@@ -0,0 +1,101 @@
+import random
+from datetime import date
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import phase_core  # noqa: E402
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(phase_core, "PRICE_CACHE_DIR", tmp_path)
+    monkeypatch.setenv("PHASE_CACHE_TTL_H", "1")
+    return tmp_path
+
+
+def test_save_drops_only_this_tickers_old_files(cache_dir):
+    keep = [
+        phase_core.price_cache_path("BRK_B", date(2026, 10, 13)),
+        cache_dir / "BRK_notes.json",
+        cache_dir / "BRK_2026101.json",
+    ]
+    stale = phase_core.price_cache_path("BRK", date(2026, 10, 13))
+    for path in (*keep, stale):
+        path.write_text('{"closes": [1.0]}')
+
+    phase_core.save_cached_closes("BRK", [1.0, 2.0])
+
+    assert not stale.exists()
+    assert all(path.exists() for path in keep)
+    assert phase_core.load_cached_closes("BRK") == [1.0, 2.0]
+
+
+# The original pure-Python indicators, kept as the reference analyze_closes must reproduce.
+def _ema(prices, period):
+    if len(prices) < period:
+        return prices[-1]
+    k = 2 / (period + 1)
+    value = sum(prices[:period]) / period
+    for p in prices[period:]:
+        value = ((p - value) * k) + value
+    return round(value, 4)
+
+
+def _sma(prices, period):
+    if len(prices) < period:
+        return prices[-1]
+    return round(sum(prices[-period:]) / period, 4)
+
+
+def _wma(prices, period):
+    if len(prices) < period:
+        return prices[-1]
+    weights = range(1, period + 1)
+    return round(sum(w * p for w, p in zip(weights, prices[-period:])) / sum(weights), 4)
+
+
+def _hma(prices, period):
+    half = max(1, period // 2)
+    sqrt_period = max(1, int(period**0.5))
+    if len(prices) < period + sqrt_period:
+        return round(prices[-1], 4)
+    raw = [2 * _wma(prices[: i + 1], half) - _wma(prices[: i + 1], period) for i in range(period - 1, len(prices))]
+    return round(_wma(raw, sqrt_period), 4)
+
+
+def reference_analysis(closes, cfg):
+    ema_p, sma_p, hma_p = cfg["ema_period"], cfg["sma_period"], cfg["hma_period"]
+    price = closes[-1]
+    ema_val, sma_val = _ema(closes, ema_p), _sma(closes, sma_p)
+    hma_val, hma_prev = _hma(closes, hma_p), _hma(closes[:-1], hma_p)
+    return {
+        "ticker": "X",
+        "phase": phase_core.get_phase(price, ema_val, sma_val, hma_val, hma_prev),
+        "price": round(price, 2),
+        "ema10": ema_val,
+        "sma30": sma_val,
+        "hma": hma_val,
+        "hmaPrev": hma_prev,
+        "hmaTrend": "falling" if hma_val < hma_prev else "rising" if hma_val > hma_prev else "flat",
+        "hmaCross": (
+            "bearish" if hma_prev < price < hma_val else "bullish" if hma_val < price < hma_prev else "neutral"
+        ),
+    }
+
+
+@pytest.mark.parametrize("hma_period", [10, 20, 30, 40, 60])
+def test_analyze_closes_matches_pure_python_indicators(hma_period):
+    rng = random.Random(hma_period)
+    cfg = {"ema_period": 10, "sma_period": 30, "hma_period": hma_period}
+    for _ in range(150):
+        closes = [100 + rng.gauss(0, 5) for _ in range(rng.randint(30, 120))]
+        assert phase_core.analyze_closes("X", closes, cfg) == reference_analysis(closes, cfg)
+
+
+def test_analyze_closes_insufficient_data():
+    assert phase_core.analyze_closes("X", [1.0] * 29, {"ema_period": 10, "sma_period": 30}) == {
+        "error": "Insufficient data",
+        "ticker": "X",
+    }
@@ -0,0 +1,66 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+import run_morning_brief as brief
+
+
+def decimal_currency(value):
+    """The original Decimal formatting: half-up on str(value)."""
+    quantized = Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    sign = "-" if quantized < 0 else ""
+    return f"{sign}${abs(quantized):,.2f}"
+
+
+def decimal_pct(value):
+    quantized = Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    sign = "+" if quantized > 0 else ""
+    return f"{sign}{quantized:.2f}%"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("12.345", "$12.35"),
+        (12.345, "$12.35"),
+        (1.005, "$1.01"),
+        (0.125, "$0.13"),
+        (-0.005, "-$0.01"),
+        (-0.004, "$0.00"),
+        (-1234567.895, "-$1,234,567.90"),
+        (0, "$0.00"),
+        (None, "$0.00"),
+        ("n/a", "$0.00"),
+    ],
+)
+def test_fmt_currency_half_up(value, expected):
+    assert brief.fmt_currency(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (12.345, "+12.35%"),
+        ("1.005", "+1.01%"),
+        (-0.005, "-0.01%"),
+        (-0.004, "-0.00%"),
+        (-0.0, "-0.00%"),
+        (0, "0.00%"),
+        (-12.5, "-12.50%"),
+        (None, "0.00%"),
+    ],
+)
+def test_fmt_pct_half_up(value, expected):
+    assert brief.fmt_pct(value) == expected
+
+
+def test_formatting_matches_decimal_reference():
+    values = [
+        round(x * 0.001 - 700, places)
+        for x in range(0, 1_400_000, 997)
+        for places in (2, 3)
+    ]
+    values += [-0.001, 0.005, 99.995, -99.995, 1e15 + 0.125, "-0.004", "7"]
+    for value in values:
+        assert brief.fmt_currency(value) == decimal_currency(value), value
+        assert brief.fmt_pct(value) == decimal_pct(value), value